@@ -0,0 +1,334 @@
+#bench.py
+"""Benchmark do Executor com cargas sintéticas e reproduzíveis (sem interface gráfica).
+
+Gera uma árvore de arquivos com nomes no estilo CPF/contrato, uma planilha de
+condições com M linhas, pastas de condição e ZIPs de origem; mede cada fase
+isolada (scan, filter, match, transfer, zip) e a execução completa (e2e), e
+grava o resultado em JSON para comparar execuções.
+
+Uso:
+    python bench.py --files 5000 --rows 20000 --out resultado.json
+    python bench.py --phases match --engine vector --compare resultado.json
+"""
+import os, sys, json, time, random, shutil, zipfile, argparse, platform, tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import executor
+from executor import (
+    Executor, FileManager, FileFilter, ExcelConditionEngine, FolderConditionEngine,
+    copy_file, zip_directory, benchmark_copy_backends,
+)
+
+try:
+    import resource  # só POSIX
+except ImportError:
+    resource = None
+
+PHASES = ("scan", "filter", "match", "folders", "transfer", "zip", "e2e")
+
+NOMES = ["silva", "souza", "lima", "costa", "rocha", "oliveira", "pereira", "almeida", "gomes", "ribeiro"]
+CIDADES = ["Recife", "Natal", "Belem", "Salvador", "Fortaleza", ""]
+TIPOS = ["contrato", "rg", "comprovante", "extrato", "procuracao"]
+
+# ---------- medição ----------
+
+def peak_rss_mb():
+    """Pico de memória residente do processo até agora (MB), se disponível."""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+    try:
+        import psutil
+        return round(psutil.Process().memory_info().peak_wset / (1024 * 1024), 1)
+    except Exception:
+        return None
+
+def summarize(items, seconds, latencies=None, nbytes=None):
+    out = {
+        "items": items,
+        "seconds": round(seconds, 4),
+        "items_s": round(items / seconds, 1) if seconds > 0 else None,
+    }
+    if nbytes is not None:
+        out["bytes"] = nbytes
+        out["mb_s"] = round(nbytes / (1024 * 1024) / seconds, 1) if seconds > 0 else None
+    if latencies:
+        lat = np.asarray(latencies) * 1000
+        out["p50_ms"] = round(float(np.percentile(lat, 50)), 4)
+        out["p99_ms"] = round(float(np.percentile(lat, 99)), 4)
+    out["peak_rss_mb"] = peak_rss_mb()
+    return out
+
+def timed(iterable):
+    """Gera (item, latência) medindo o tempo até cada item ficar pronto."""
+    t = time.perf_counter()
+    for item in iterable:
+        now = time.perf_counter()
+        yield item, now - t
+        t = time.perf_counter()
+
+# ---------- carga sintética ----------
+
+def _cpf(rng):
+    return "".join(str(rng.randint(0, 9)) for _ in range(11))
+
+def build_workload(root, files=2000, rows=5000, depth=3, zips=2, zip_members=200, size_kb=16, seed=42):
+    """Cria a carga em ``root`` e devolve um dicionário com os caminhos gerados."""
+    rng = random.Random(seed)
+    root = Path(root)
+    if root.exists():
+        shutil.rmtree(root)
+    src, cond_folder = root / "origem", root / "condicoes"
+    src.mkdir(parents=True)
+
+    people = [{"CPF": _cpf(rng), "Nome": rng.choice(NOMES), "Contrato": f"CT{rng.randint(10**5, 10**6 - 1)}",
+               "Cidade": rng.choice(CIDADES)} for _ in range(rows)]
+    pd.DataFrame(people).to_excel(root / "condicoes.xlsx", index=False)
+
+    # pastas de condição: nome_cidade
+    for nome in NOMES:
+        for cidade in CIDADES[:-1]:
+            (cond_folder / f"{nome}_{cidade}").mkdir(parents=True, exist_ok=True)
+
+    # hierarquia aninhada: origem/a0/b1/c2...
+    dirs = [src]
+    for level in range(depth):
+        dirs += [d / f"{'abcdefgh'[level]}{i}" for d in dirs[-(3 ** level):] for i in range(3)]
+    for d in dirs:
+        d.mkdir(parents=True, exist_ok=True)
+
+    payload = rng.randbytes(size_kb * 1024) if hasattr(rng, "randbytes") else os.urandom(size_kb * 1024)
+
+    def name(i):
+        p = people[rng.randrange(rows)] if rng.random() < 0.8 else {"CPF": _cpf(rng), "Nome": rng.choice(NOMES),
+                                                                     "Contrato": "CT000000", "Cidade": ""}
+        cpf = p["CPF"] if i % 2 else f"{p['CPF'][:3]}.{p['CPF'][3:6]}.{p['CPF'][6:9]}-{p['CPF'][9:]}"
+        ext = rng.choice([".pdf", ".pdf", ".txt", ".jpg", ".docx"])
+        return f"{p['Nome']}_{cpf}_{p['Contrato']}_{rng.choice(TIPOS)}_{i}{ext}"
+
+    for i in range(files):
+        (rng.choice(dirs) / name(i)).write_bytes(payload[: rng.randint(1, len(payload))])
+
+    for z in range(zips):
+        with zipfile.ZipFile(src / f"lote{z}.zip", "w", zipfile.ZIP_DEFLATED) as zf:
+            for i in range(zip_members):
+                zf.writestr(f"docs/{name(files + z * zip_members + i)}", payload[: rng.randint(1, len(payload))])
+
+    return {"root": str(root), "origem": str(src), "excel": str(root / "condicoes.xlsx"),
+            "cond_folder": str(cond_folder), "files": files, "rows": rows, "zips": zips,
+            "zip_members": zip_members, "depth": depth, "size_kb": size_kb, "seed": seed}
+
+def base_config(w, destino, workers=4, engine="auto", expr="!CPF! & !Nome!"):
+    return {
+        "origens": [w["origem"]], "destino": str(destino), "action": "copy",
+        "extract_zips": True, "recursivo": True, "criar_subpasta": False, "hierarchy": True,
+        "multiply": False, "sobra_enabled": True, "sobra": "sobra", "zip_dest": False,
+        "max_workers": workers, "use_conditions": True, "condition_mode": "excel",
+        "excel": w["excel"], "cond_folder": w["cond_folder"], "cond_sep": "_",
+        "colunas": {"CPF": "CPF", "Nome": "Nome", "Contrato": "Contrato", "Cidade": "Cidade"},
+        "principais": ["Nome"], "condition_expression": expr, "match_engine": engine,
+        "copy_dirs": False, "file_filters": {}, "rename": {"enabled": False, "pattern": ""},
+        # diário e perfil na pasta de trabalho: não sobrescrevem os da interface em ~/.gaal
+        "journal": False,
+        "journal_path": str(Path(destino).parent / "diario.jsonl"),
+        "profile_path": str(Path(destino).parent / "perfil.json"),
+    }
+
+# ---------- fases ----------
+
+def phase_scan(w, cfg):
+    fm = FileManager([w["origem"]], cfg["destino"], "copy", extract_zips=True, recursivo=True)
+    t0 = time.perf_counter()
+    lat = [dt for _, dt in timed(fm.iter_files())]
+    seconds = time.perf_counter() - t0
+    fm.cleanup()
+    return summarize(len(lat), seconds, lat)
+
+def phase_filter(w, cfg):
+    fm = FileManager([w["origem"]], cfg["destino"], "copy", extract_zips=True, recursivo=True)
+    entries = list(fm.iter_files())
+    fm.cleanup()
+    ff = FileFilter({"types": ["pdf", "docx"], "date_start": "01-01-2000", "size_min": 1024,
+                     "name_glob": "*_*", "min_age_days": 0})
+    lat = []
+    t0 = time.perf_counter()
+    for e in entries:
+        t = time.perf_counter()
+        ff.accepts_name(e.path.name) and ff.accepts_stat(e.size, e.mtime, e.is_dir)
+        lat.append(time.perf_counter() - t)
+    return summarize(len(entries), time.perf_counter() - t0, lat)
+
+def _stems(w):
+    fm = FileManager([w["origem"]], w["root"], "copy", extract_zips=True, recursivo=True)
+    stems = [e.path.stem for e in fm.iter_files()]
+    fm.cleanup()
+    return stems
+
+def phase_match(w, cfg):
+    t0 = time.perf_counter()
+    ce = ExcelConditionEngine(cfg["excel"], cfg["colunas"], cfg["principais"],
+                              cfg["condition_expression"], engine=cfg["match_engine"], cache_size=0)
+    load = time.perf_counter() - t0
+    stems = _stems(w)
+    lat = []
+    t0 = time.perf_counter()
+    if ce.vector is not None:
+        # como no Executor: prefetch em lotes
+        for i in range(0, len(stems), 256):
+            t = time.perf_counter()
+            batch = stems[i:i + 256]
+            ce.prefetch(batch)
+            for s in batch:
+                ce.match(s)
+            lat += [(time.perf_counter() - t) / len(batch)] * len(batch)
+    else:
+        for s in stems:
+            t = time.perf_counter()
+            ce.match(s)
+            lat.append(time.perf_counter() - t)
+    out = summarize(len(stems), time.perf_counter() - t0, lat)
+    out["load_seconds"] = round(load, 4)
+    out["engine"] = "vector" if ce.vector is not None else "index"
+    return out
+
+def phase_folders(w, cfg):
+    ce = FolderConditionEngine(cfg["cond_folder"], {"Nome": 1}, [], "_", "!Nome!")
+    stems = _stems(w)
+    lat = []
+    t0 = time.perf_counter()
+    for s in stems:
+        t = time.perf_counter()
+        ce.matched_subfolders(s)
+        lat.append(time.perf_counter() - t)
+    return summarize(len(stems), time.perf_counter() - t0, lat)
+
+def phase_transfer(w, cfg):
+    dest = Path(cfg["destino"]) / "transfer"
+    dest.mkdir(parents=True, exist_ok=True)
+    files = [p for p in Path(w["origem"]).rglob("*") if p.is_file() and p.suffix != ".zip"]
+    lat, nbytes, used = [], 0, {}
+    t0 = time.perf_counter()
+    for i, p in enumerate(files):
+        t = time.perf_counter()
+        backend = copy_file(p, dest / f"{i}_{p.name}", backend=cfg.get("copy_backend", "auto"))
+        lat.append(time.perf_counter() - t)
+        nbytes += p.stat().st_size
+        used[backend] = used.get(backend, 0) + 1
+    out = summarize(len(files), time.perf_counter() - t0, lat, nbytes)
+    out["backends"] = used
+    big = max(files, key=lambda p: p.stat().st_size, default=None)
+    if big is not None:
+        out["backend_mb_s"] = benchmark_copy_backends(big, dest, repeats=3)
+    return out
+
+def phase_zip(w, cfg):
+    dest = Path(cfg["destino"]) / "transfer"
+    if not dest.exists():
+        phase_transfer(w, cfg)
+    st = zip_directory(dest, Path(cfg["destino"]) / "bench.zip", workers=cfg["max_workers"])
+    out = summarize(st["files"], st["seconds"], None, st["bytes_in"])
+    out["ratio"] = round(st["bytes_out"] / st["bytes_in"], 3) if st["bytes_in"] else None
+    out["stored"] = st["stored"]
+    return out
+
+def phase_e2e(w, cfg):
+    dest = Path(cfg["destino"]) / "e2e"
+    if dest.exists():
+        shutil.rmtree(dest)
+    dest.mkdir(parents=True)
+    cfg = dict(cfg, destino=str(dest))
+    reports = []
+    t0 = time.perf_counter()
+    ex = Executor(cfg, max_workers=cfg["max_workers"], report_callback=reports.append,
+                  error_callback=lambda e: print(f"  erro: {e}", file=sys.stderr))
+    ex.run()
+    seconds = time.perf_counter() - t0
+    lat = [r["tempo_ms"] / 1000 for r in reports if r.get("tempo_ms") is not None]
+    nbytes = sum(os.path.getsize(r["destino"]) for r in reports if os.path.isfile(r["destino"]))
+    out = summarize(len(reports), seconds, lat, nbytes)
+    out["stats"] = {k: v for k, v in ex.stats.items() if k != "zip"}
+    return out
+
+PHASE_FUNCS = {"scan": phase_scan, "filter": phase_filter, "match": phase_match, "folders": phase_folders,
+               "transfer": phase_transfer, "zip": phase_zip, "e2e": phase_e2e}
+
+# ---------- comparação ----------
+
+def compare(old, new):
+    """Imprime a variação de throughput e latência entre dois resultados."""
+    for name, cur in new["phases"].items():
+        ref = old.get("phases", {}).get(name)
+        if not ref:
+            continue
+        parts = []
+        for key in ("items_s", "mb_s", "p50_ms", "p99_ms", "peak_rss_mb"):
+            a, b = ref.get(key), cur.get(key)
+            if a and b:
+                parts.append(f"{key} {a} → {b} ({(b - a) / a * 100:+.1f}%)")
+        print(f"{name:9s} " + "; ".join(parts))
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark do Executor com cargas sintéticas.")
+    ap.add_argument("--files", type=int, default=2000, help="arquivos na árvore de origem")
+    ap.add_argument("--rows", type=int, default=5000, help="linhas da planilha de condições")
+    ap.add_argument("--depth", type=int, default=3, help="profundidade da hierarquia de pastas")
+    ap.add_argument("--zips", type=int, default=2, help="ZIPs na origem")
+    ap.add_argument("--zip-members", type=int, default=200, help="arquivos em cada ZIP")
+    ap.add_argument("--size-kb", type=int, default=16, help="tamanho máximo de cada arquivo (KB)")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--engine", choices=("auto", "index", "vector"), default="auto")
+    ap.add_argument("--expr", default="!CPF! & !Nome!", help="expressão de condições")
+    ap.add_argument("--phases", default=",".join(PHASES), help="fases separadas por vírgula")
+    ap.add_argument("--workdir", help="pasta de trabalho (padrão: temporária, apagada no fim)")
+    ap.add_argument("--out", help="arquivo JSON de saída")
+    ap.add_argument("--compare", help="JSON de uma execução anterior para comparar")
+    args = ap.parse_args(argv)
+
+    phases = [p.strip() for p in args.phases.split(",") if p.strip()]
+    unknown = set(phases) - set(PHASES)
+    if unknown:
+        ap.error(f"fases desconhecidas: {', '.join(sorted(unknown))}")
+
+    workdir = Path(args.workdir) if args.workdir else Path(tempfile.mkdtemp(prefix="gaal_bench_"))
+    try:
+        t0 = time.perf_counter()
+        w = build_workload(workdir / "carga", args.files, args.rows, args.depth, args.zips,
+                           args.zip_members, args.size_kb, args.seed)
+        print(f"carga gerada em {time.perf_counter() - t0:.1f} s ({workdir})")
+        cfg = base_config(w, workdir / "destino", args.workers, args.engine, args.expr)
+        Path(cfg["destino"]).mkdir(parents=True, exist_ok=True)
+        result = {
+            "meta": {
+                "data": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(),
+                "plataforma": platform.platform(), "cpus": os.cpu_count(),
+                "aho_corasick_c": executor.ahocorasick is not None,
+                "workload": {k: v for k, v in w.items() if k not in ("root", "origem", "excel", "cond_folder")},
+                "workers": args.workers, "engine": args.engine, "expr": args.expr,
+            },
+            "phases": {},
+        }
+        for name in phases:
+            print(f"- {name}...", end=" ", flush=True)
+            res = PHASE_FUNCS[name](w, cfg)
+            result["phases"][name] = res
+            print(f"{res['items']} itens em {res['seconds']:.3f} s"
+                  + (f", {res['items_s']}/s" if res.get("items_s") else "")
+                  + (f", p99 {res['p99_ms']} ms" if "p99_ms" in res else ""))
+        if args.out:
+            with open(args.out, "w", encoding="utf-8") as fh:
+                json.dump(result, fh, indent=2, ensure_ascii=False)
+            print(f"resultado salvo em {args.out}")
+        if args.compare:
+            with open(args.compare, "r", encoding="utf-8") as fh:
+                compare(json.load(fh), result)
+        return result
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
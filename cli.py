@@ -0,0 +1,203 @@
+#cli.py
+"""Execução sem interface gráfica: roda uma config salva (JSON) com o Executor.
+
+A config é o mesmo dicionário montado por ``MainWindow.collect_config`` (o botão
+"Salvar config" da janela grava exatamente esse JSON). Não importa PySide6, então
+serve para agendar execuções noturnas em servidores ou rodar vários jobs em
+paralelo — cada config tem seu próprio diário (para ``--retomar``) e perfil em
+``~/.gaal/cli``.
+
+Uso:
+    python cli.py minha_config.json
+    python cli.py minha_config.json --json --relatorio relatorio.csv
+    python cli.py minha_config.json --retomar
+    python cli.py --retomar                 # retoma a última execução da interface
+
+Códigos de saída: 0 concluído sem erros, 1 concluído com erros, 2 config
+inválida (ou nada para retomar), 130 cancelado (Ctrl+C / SIGTERM).
+"""
+import sys, json, time, signal, hashlib, argparse
+from pathlib import Path
+
+from executor import Executor, RunJournal, CACHE_DIR, check_config
+from report import ReportStore, export_report
+
+EXIT_OK, EXIT_ERRORS, EXIT_CONFIG, EXIT_CANCELED = 0, 1, 2, 130
+
+def load_config(path):
+    """Lê a config de um arquivo JSON (``-`` lê da entrada padrão)."""
+    if path == "-":
+        cfg = json.load(sys.stdin)
+    else:
+        with open(path, "r", encoding="utf-8") as fh:
+            cfg = json.load(fh)
+    if not isinstance(cfg, dict):
+        raise ValueError("o JSON da config deve ser um objeto")
+    return cfg
+
+def job_files(config_path):
+    """Diário e perfil próprios de uma config, para jobs paralelos não se atropelarem."""
+    key = hashlib.blake2b(str(Path(config_path).resolve()).encode("utf-8"), digest_size=6).hexdigest()
+    base = CACHE_DIR / "cli" / f"{Path(config_path).stem}-{key}"
+    return base.with_suffix(".jsonl"), base.with_suffix(".perfil.json")
+
+class ConsoleProgress:
+    """Progresso no console: linha única reescrita em terminal, linhas periódicas
+    em logs; com ``json_lines`` cada evento vira uma linha JSON na saída padrão."""
+
+    def __init__(self, json_lines=False, quiet=False, interval=1.0):
+        self.json_lines = json_lines
+        self.quiet = quiet
+        self.interval = interval
+        self.tty = sys.stderr.isatty()
+        self.errors = 0
+        self._last = 0.0
+
+    def event(self, kind, **data):
+        sys.stdout.write(json.dumps({"evento": kind, "t": round(time.time(), 3), **data},
+                                    ensure_ascii=False, default=str) + "\n")
+        sys.stdout.flush()
+
+    def progress(self, done, total, scanning=False, info=None):
+        info = info or {}
+        now = time.monotonic()
+        final = done >= total and not scanning
+        if not final and now - self._last < self.interval:
+            return
+        self._last = now
+        if self.json_lines:
+            self.event("progresso", processados=done, total=total, varrendo=scanning,
+                       bytes=info.get("bytes"), atual=info.get("current"),
+                       arquivos_s=info.get("files_s"), mb_s=info.get("mb_s"), eta_s=info.get("eta_s"))
+        elif not self.quiet:
+            total_txt = f"{total}+" if scanning else str(total)
+            line = f"{done}/{total_txt} arquivos"
+            if info.get("files_s"):
+                line += f" · {info['files_s']:.1f} arquivos/s · {info['mb_s']:.1f} MB/s"
+                if info.get("eta_s") is not None and not final:
+                    line += f" · ETA {'≥ ' if scanning else ''}{time.strftime('%H:%M:%S', time.gmtime(info['eta_s']))}"
+            sys.stderr.write(("\r" + line.ljust(78)) if self.tty else line + "\n")
+            sys.stderr.flush()
+
+    def metrics(self, snapshot):
+        if self.json_lines:
+            self.event("metricas", **snapshot)
+
+    def error(self, message):
+        self.errors += 1
+        if self.json_lines:
+            self.event("erro", mensagem=str(message))
+        else:
+            if self.tty and not self.quiet:
+                sys.stderr.write("\n")
+            sys.stderr.write(f"ERRO: {message}\n")
+
+    def close(self):
+        if self.tty and not self.quiet and not self.json_lines:
+            sys.stderr.write("\n")
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Executa uma config do G.A.A.L sem interface gráfica.")
+    ap.add_argument("config", nargs="?", help="config JSON salva pela interface (- para entrada padrão)")
+    ap.add_argument("--retomar", action="store_true",
+                    help="continua a execução interrompida desta config (sem config: a última da interface)")
+    ap.add_argument("--workers", type=int, help="threads de trabalho (padrão: max_workers da config)")
+    ap.add_argument("--json", action="store_true", help="eventos em JSON Lines na saída padrão")
+    ap.add_argument("--quiet", action="store_true", help="só erros e o resumo final")
+    ap.add_argument("--relatorio", help="grava o relatório (.xlsx, .csv ou .jsonl)")
+    ap.add_argument("--intervalo", type=float, default=1.0, help="segundos entre linhas de progresso")
+    args = ap.parse_args(argv)
+    if not args.config and not args.retomar:
+        ap.error("informe a config ou use --retomar")
+
+    out = ConsoleProgress(json_lines=args.json, quiet=args.quiet, interval=args.intervalo)
+
+    def fail(message):
+        if args.json:
+            out.event("fim", status="config_invalida", mensagem=message)
+        else:
+            sys.stderr.write(f"Config inválida: {message}\n")
+        return EXIT_CONFIG
+
+    journal_path = profile_path = None
+    if args.config and args.config != "-":
+        journal_path, profile_path = job_files(args.config)
+    if args.retomar:
+        last = RunJournal.load_last(journal_path)
+        if last is None:
+            return fail("não há execução interrompida para retomar")
+        cfg = last[0]
+    else:
+        try:
+            cfg = load_config(args.config)
+        except (OSError, ValueError) as e:
+            return fail(f"não foi possível ler {args.config}: {e}")
+        if journal_path is not None:
+            cfg.setdefault("journal_path", str(journal_path))
+            cfg.setdefault("profile_path", str(profile_path))
+    if args.workers:
+        cfg["max_workers"] = args.workers
+    cfg.setdefault("max_workers", 4)
+
+    problemas = check_config(cfg)
+    if problemas:
+        return fail("; ".join(problemas))
+
+    canceled = []
+    def on_signal(signum, frame):
+        if canceled:
+            raise KeyboardInterrupt
+        canceled.append(signum)
+    signal.signal(signal.SIGINT, on_signal)
+    if hasattr(signal, "SIGTERM"):
+        signal.signal(signal.SIGTERM, on_signal)
+
+    report = ReportStore()
+    try:
+        executor = Executor(
+            cfg,
+            max_workers=cfg["max_workers"],
+            progress_callback=out.progress,
+            error_callback=out.error,
+            cancel_checker=lambda: bool(canceled),
+            report_callback=report.append,
+            resume=args.retomar,
+            metrics_callback=out.metrics,
+        )
+    except Exception as e:
+        return fail(str(e))
+
+    if args.json:
+        out.event("inicio", config=args.config, retomando=args.retomar)
+    executor.run()
+    out.close()
+
+    if args.relatorio:
+        try:
+            export_report(report, args.relatorio)
+        except (OSError, ValueError) as e:
+            out.error(f"Não foi possível gravar o relatório: {e}")
+
+    stats = executor.stats
+    if canceled:
+        status, code = "cancelado", EXIT_CANCELED
+    elif out.errors:
+        status, code = "erros", EXIT_ERRORS
+    else:
+        status, code = "ok", EXIT_OK
+    resumo = {k: v for k, v in stats.items() if k != "profile"}
+    if args.json:
+        out.event("fim", status=status, erros=out.errors, itens=len(report), stats=resumo,
+                  metricas=stats.get("profile", {}).get("metricas"))
+    else:
+        m = stats.get("profile", {}).get("metricas", {})
+        sys.stderr.write(
+            f"{status.upper()}: {len(report)} itens, {stats.get('transferred', 0)} transferidos, "
+            f"{stats.get('skipped', 0)} pulados, {out.errors} erros em {m.get('elapsed_s', 0):.1f} s\n")
+        if canceled and cfg.get("journal", True):
+            cmd = " ".join(["python cli.py"] + ([args.config] if args.config else []) + ["--retomar"])
+            sys.stderr.write(f"Para continuar: {cmd}\n")
+    return code
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,35 +1,460 @@
 #executor.py
-import os, re, shutil, zipfile, tempfile
+import io, os, re, sys, csv, json, time, errno, queue, shutil, pickle, sqlite3, fnmatch, zipfile, zlib, tempfile, threading, hashlib
+from functools import lru_cache
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+import numpy as np
 import pandas as pd
 
-def match_filters(f, filters):
-    if not filters:
+try:
+    import fcntl  # só POSIX: ioctl FICLONE (reflink)
+except ImportError:
+    fcntl = None
+
+try:
+    import ahocorasick  # pyahocorasick (opcional): autômato em C, bem mais compacto
+except ImportError:
+    ahocorasick = None
+
+class FileFilter:
+    """Filtros de arquivo compilados uma única vez a partir de ``file_filters``.
+
+    Chaves aceitas: ``types`` (extensões), ``date_start``/``date_end``
+    (dd-mm-aaaa ou aaaa-mm-dd), ``size_min``/``size_max`` (bytes),
+    ``name_glob``, ``name_regex`` e ``min_age_days``. Os predicados que só
+    dependem do nome (``accepts_name``) rodam antes de qualquer stat.
+    """
+
+    def __init__(self, filters=None):
+        filters = filters or {}
+        types = filters.get("types") or ()
+        self.types = frozenset(t.strip().lower().lstrip(".") for t in types if t.strip()) or None
+        self.start = self._epoch(filters.get("date_start"))
+        self.end = self._epoch(filters.get("date_end"))
+        self.size_min = int(filters["size_min"]) if filters.get("size_min") not in (None, "") else None
+        self.size_max = int(filters["size_max"]) if filters.get("size_max") not in (None, "") else None
+        self.name_re = []
+        try:
+            if filters.get("name_glob"):
+                self.name_re.append(re.compile(fnmatch.translate(filters["name_glob"]), re.IGNORECASE))
+            if filters.get("name_regex"):
+                self.name_re.append(re.compile(filters["name_regex"], re.IGNORECASE))
+        except re.error as e:
+            raise ValueError(f"Filtro de nome inválido: {e}")
+        min_age = filters.get("min_age_days")
+        self.max_mtime = time.time() - float(min_age) * 86400 if min_age not in (None, "") else None
+        self.needs_stat = any(v is not None for v in (self.start, self.end, self.size_min, self.size_max, self.max_mtime))
+
+    @staticmethod
+    def _epoch(txt):
+        if not txt:
+            return None
+        for fmt in ('%Y-%m-%d', '%d-%m-%Y'):
+            try:
+                return datetime.strptime(txt, fmt).timestamp()
+            except ValueError:
+                continue
+        raise ValueError(f"Data inválida no filtro: {txt!r} (use dd-mm-aaaa ou aaaa-mm-dd)")
+
+    def __bool__(self):
+        return bool(self.types or self.name_re or self.needs_stat)
+
+    def accepts_name(self, name):
+        if self.types is not None:
+            ext = os.path.splitext(name)[1].lower()[1:]  # ".pdf" -> "pdf"
+            if ext not in self.types:
+                return False
+        for rx in self.name_re:
+            if not rx.search(name):
+                return False
         return True
-    # --- Por extensão ---
-    ext = f.suffix.lower()[1:]  # ".pdf" -> "pdf"
-    if 'types' in filters and filters['types']:
-        if ext not in filters['types']:
+
+    def accepts_stat(self, size, mtime, is_dir=False):
+        if self.start is not None and mtime < self.start:
             return False
-    # --- Por data ---
-    stat = f.stat()
-    if 'date_start' in filters and filters['date_start']:
-        try:
-            dt_ini = datetime.strptime(filters['date_start'], '%Y-%m-%d')
-        except Exception:
-            dt_ini = datetime.strptime(filters['date_start'], '%d-%m-%Y')
-        if datetime.fromtimestamp(stat.st_mtime) < dt_ini:
+        if self.end is not None and mtime > self.end:
             return False
-    if 'date_end' in filters and filters['date_end']:
-        try:
-            dt_fim = datetime.strptime(filters['date_end'], '%Y-%m-%d')
-        except Exception:
-            dt_fim = datetime.strptime(filters['date_end'], '%d-%m-%Y')
-        if datetime.fromtimestamp(stat.st_mtime) > dt_fim:
+        if self.max_mtime is not None and mtime > self.max_mtime:
             return False
-    return True
+        if not is_dir:
+            if self.size_min is not None and size < self.size_min:
+                return False
+            if self.size_max is not None and size > self.size_max:
+                return False
+        return True
+
+def match_filters(f, filters, stat=None):
+    """Compatibilidade: prefira montar um FileFilter uma vez e reutilizá-lo."""
+    ff = filters if isinstance(filters, FileFilter) else FileFilter(filters)
+    if not ff.accepts_name(f.name):
+        return False
+    if not ff.needs_stat:
+        return True
+    st = stat() if callable(stat) else (stat or f.stat())
+    return ff.accepts_stat(st.st_size, st.st_mtime, os.path.isdir(f))
+
+class CopyCanceled(Exception):
+    """Cópia interrompida por cancelamento (o arquivo parcial é removido)."""
+
+COPY_CHUNK = 1024 * 1024
+
+# ---- Backends de cópia ----
+# Cada backend copia de ``fin`` para ``fout`` (descritores) a partir da posição
+# atual até o fim. Se o sistema não suportar, levanta OSError antes de escrever
+# e ``copy_file`` passa para o próximo da lista.
+
+_FICLONE = 0x40049409  # ioctl do Linux (btrfs, XFS com reflink, bcachefs...)
+
+# erros que significam "este backend não serve aqui", não falha de E/S
+_UNSUPPORTED = {errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EBADF, errno.EPERM,
+                errno.ETXTBSY, errno.EOPNOTSUPP, getattr(errno, "ENOTSUP", errno.EOPNOTSUPP),
+                getattr(errno, "ENOTTY", errno.EINVAL), getattr(errno, "ENOTSOCK", errno.EINVAL)}
+
+def _copy_reflink(fin, fout, chunk_size, cancel):
+    # clona as extensões do arquivo (copy-on-write): nenhum byte é copiado
+    fcntl.ioctl(fout, _FICLONE, fin)
+
+def _copy_range(fin, fout, chunk_size, cancel):
+    # cópia dentro do kernel; em NFS/SMB modernos pode virar server-side copy
+    while True:
+        if cancel():
+            raise CopyCanceled()
+        if os.copy_file_range(fin, fout, chunk_size) == 0:
+            break
+
+def _copy_sendfile(fin, fout, chunk_size, cancel):
+    offset = os.lseek(fin, 0, os.SEEK_CUR)
+    while True:
+        if cancel():
+            raise CopyCanceled()
+        sent = os.sendfile(fout, fin, offset, chunk_size)
+        if sent == 0:
+            break
+        offset += sent
+
+def _copy_readinto(fin, fout, chunk_size, cancel):
+    # laço em espaço de usuário com um único buffer reaproveitado
+    reader = io.FileIO(fin, "rb", closefd=False)
+    buf = bytearray(chunk_size)
+    view = memoryview(buf)
+    while True:
+        if cancel():
+            raise CopyCanceled()
+        n = reader.readinto(buf)
+        if not n:
+            break
+        written = 0
+        while written < n:
+            written += os.write(fout, view[written:n])
+
+COPY_BACKENDS = {}
+if fcntl is not None and os.name == "posix":
+    COPY_BACKENDS["reflink"] = _copy_reflink
+if hasattr(os, "copy_file_range"):
+    COPY_BACKENDS["copy_file_range"] = _copy_range
+if hasattr(os, "sendfile") and sys.platform.startswith("linux"):
+    # no macOS/BSD o destino do sendfile precisa ser um socket (ENOTSOCK)
+    COPY_BACKENDS["sendfile"] = _copy_sendfile
+COPY_BACKENDS["readinto"] = _copy_readinto
+
+def copy_file(src, dst, cancel_checker=None, chunk_size=COPY_CHUNK,
+              backend="auto", preserve_metadata=True):
+    """Copia ``src`` para ``dst`` e devolve o nome do backend que fez a cópia.
+
+    ``backend="auto"`` tenta reflink, ``copy_file_range``, ``sendfile`` e por fim
+    o laço ``readinto``; um nome específico tenta só ele (com ``readinto`` de
+    reserva). O cancelamento é checado entre blocos, para que "Cancelar" não
+    espere arquivos grandes. ``preserve_metadata=False`` pula o ``copystat``
+    (caro em compartilhamentos de rede)."""
+    cancel = cancel_checker or (lambda: False)
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise shutil.SameFileError(f"{src!r} e {dst!r} são o mesmo arquivo")
+    if backend == "auto":
+        order = list(COPY_BACKENDS)
+    else:
+        order = [b for b in (backend, "readinto") if b in COPY_BACKENDS]
+    used = None
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            fin, fout = fsrc.fileno(), fdst.fileno()
+            for name in order:
+                try:
+                    COPY_BACKENDS[name](fin, fout, chunk_size, cancel)
+                    used = name
+                    break
+                except OSError as e:
+                    if e.errno not in _UNSUPPORTED or name == "readinto":
+                        raise
+                    # retoma o próximo backend de onde este parou
+                    os.lseek(fin, os.lseek(fout, 0, os.SEEK_CUR), os.SEEK_SET)
+    except CopyCanceled:
+        try:
+            os.unlink(dst)
+        except OSError:
+            pass
+        raise CopyCanceled(str(src))
+    if preserve_metadata:
+        shutil.copystat(src, dst)
+    return used
+
+def move_file(src, dst, cancel_checker=None, chunk_size=COPY_CHUNK,
+              backend="auto", preserve_metadata=True):
+    """Move ``src`` para ``dst`` e devolve o método usado.
+
+    No mesmo sistema de arquivos (mesmo ``st_dev``) é só um ``os.replace``
+    (troca de metadados, atômica). Entre dispositivos copia com ``copy_file``,
+    confere o tamanho da cópia e só então apaga a origem."""
+    src, dst = Path(src), Path(dst)
+    if os.stat(src).st_dev == os.stat(dst.parent).st_dev:
+        try:
+            os.replace(src, dst)
+            return "rename"
+        except OSError as e:
+            # ex.: Windows entre volumes montados na mesma letra; cai na cópia
+            if e.errno not in (errno.EXDEV, errno.EACCES, errno.EPERM):
+                raise
+    used = copy_file(src, dst, cancel_checker, chunk_size, backend, preserve_metadata)
+    src_size, dst_size = os.stat(src).st_size, os.stat(dst).st_size
+    if src_size != dst_size:
+        raise OSError(f"Cópia incompleta de {src} ({dst_size} de {src_size} bytes); origem mantida")
+    os.unlink(src)
+    return f"{used}+unlink"
+
+def copy_tree(src, dst, cancel_checker=None, **copy_opts):
+    """Copia a árvore ``src`` para dentro de ``dst`` com ``copy_file``; devolve
+    os backends usados (ex.: "copy_file_range" ou "reflink,readinto")."""
+    src, dst = Path(src), Path(dst)
+    used = set()
+    dst.mkdir(parents=True, exist_ok=True)
+    for item in src.rglob("*"):
+        if item.is_file():
+            rel = item.relative_to(src)
+            (dst / rel.parent).mkdir(parents=True, exist_ok=True)
+            used.add(copy_file(item, dst / rel, cancel_checker, **copy_opts))
+    return ",".join(sorted(used)) or "mkdir"
+
+def move_tree(src, dst, cancel_checker=None, **copy_opts):
+    """Como ``move_file``, para pastas: rename no mesmo dispositivo, senão
+    copia a árvore (com cancelamento) e remove a origem."""
+    src, dst = Path(src), Path(dst)
+    if not dst.exists() and os.stat(src).st_dev == os.stat(dst.parent).st_dev:
+        try:
+            os.replace(src, dst)
+            return "rename"
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.EACCES, errno.EPERM):
+                raise
+    used = copy_tree(src, dst, cancel_checker, **copy_opts)
+    shutil.rmtree(src)
+    return f"{used}+unlink"
+
+def _zip_member_parts(name):
+    """Partes seguras do caminho de um membro (sem raiz, drive ou "..")."""
+    return [p for p in name.replace("\\", "/").split("/") if p not in ("", ".", "..") and not p.endswith(":")]
+
+def extract_zip_member(zf, info, dst, cancel_checker=None, chunk_size=COPY_CHUNK, preserve_metadata=True):
+    """Descompacta um único membro direto em ``dst`` (sem pasta temporária),
+    checando o cancelamento entre blocos. Com ``preserve_metadata`` aplica a data do ZipInfo."""
+    cancel = cancel_checker or (lambda: False)
+    try:
+        with zf.open(info) as fsrc, open(dst, "wb") as fdst:
+            while True:
+                if cancel():
+                    raise CopyCanceled(f"{zf.filename}::{info.filename}")
+                buf = fsrc.read(chunk_size)
+                if not buf:
+                    break
+                fdst.write(buf)
+    except CopyCanceled:
+        try:
+            os.unlink(dst)
+        except OSError:
+            pass
+        raise
+    if preserve_metadata:
+        mtime = time.mktime(info.date_time + (0, 0, -1))
+        os.utime(dst, (mtime, mtime))
+    return "zip"
+
+def benchmark_copy_backends(src, dst_dir, repeats=3, chunk_size=COPY_CHUNK):
+    """Mede a vazão (MB/s) de cada backend copiando ``src`` para ``dst_dir``.
+
+    Devolve ``{backend: {"mb_s": melhor vazão, "used": backend efetivo}}``; um
+    backend sem suporte no sistema de arquivos aparece com o de reserva em "used"."""
+    src = Path(src)
+    size_mb = src.stat().st_size / (1024 * 1024)
+    out = {}
+    for name in COPY_BACKENDS:
+        best, used = None, None
+        for i in range(repeats):
+            dst = Path(dst_dir) / f".bench_{name}_{i}{src.suffix}"
+            t0 = time.perf_counter()
+            used = copy_file(src, dst, chunk_size=chunk_size, backend=name, preserve_metadata=False)
+            with open(dst, "rb+") as fh:
+                os.fsync(fh.fileno())
+            elapsed = time.perf_counter() - t0
+            dst.unlink()
+            best = elapsed if best is None else min(best, elapsed)
+        out[name] = {"mb_s": round(size_mb / best, 1) if best else None, "used": used}
+    return out
+
+# ---- Compactação do destino ----
+
+# extensões já comprimidas: deflate só gasta CPU, vão "store"
+ZIP_STORE_EXTENSIONS = frozenset((
+    ".zip", ".7z", ".rar", ".gz", ".tgz", ".bz2", ".xz", ".zst", ".pdf", ".jpg", ".jpeg",
+    ".png", ".gif", ".webp", ".heic", ".mp3", ".mp4", ".m4a", ".mov", ".avi", ".mkv",
+    ".docx", ".xlsx", ".pptx", ".odt", ".ods",
+))
+
+def _deflate_member(path, arcname, level, store):
+    """Lê e comprime um arquivo numa thread do pool (o zlib libera o GIL).
+    Devolve (ZipInfo com CRC/tamanhos preenchidos, bytes do membro)."""
+    zinfo = zipfile.ZipInfo.from_file(path, arcname)
+    with open(path, "rb") as fh:
+        raw = fh.read()
+    zinfo.file_size = len(raw)
+    zinfo.CRC = zlib.crc32(raw)
+    payload = None
+    if not store:
+        comp = zlib.compressobj(level, zlib.DEFLATED, -15)
+        payload = comp.compress(raw) + comp.flush()
+        if len(payload) >= len(raw):
+            payload = None  # não compensou: guarda sem compressão
+    if payload is None:
+        zinfo.compress_type = zipfile.ZIP_STORED
+        payload = raw
+    else:
+        zinfo.compress_type = zipfile.ZIP_DEFLATED
+    zinfo.compress_size = len(payload)
+    return zinfo, payload
+
+def _write_raw_member(zf, zinfo, payload):
+    """Grava no ZipFile um membro já comprimido, do mesmo jeito que o
+    ``_ZipWriteFile`` do zipfile faz ao fechar (cabeçalho + dados + índice).
+
+    Usa estado interno do zipfile (``start_dir``, ``_didModify``, ``FileHeader``):
+    a API pública só grava comprimindo na própria thread. O teste de ida e volta
+    de ``zip_directory`` (com e sem volumes) detecta se uma versão nova do Python
+    mudar esses detalhes."""
+    if not zinfo.external_attr:
+        zinfo.external_attr = 0o600 << 16
+    zf.fp.seek(zf.start_dir)
+    zinfo.header_offset = zf.fp.tell()
+    zf._didModify = True
+    zf.fp.write(zinfo.FileHeader(zinfo.file_size > zipfile.ZIP64_LIMIT))
+    zf.fp.write(payload)
+    zf.start_dir = zf.fp.tell()
+    zf.filelist.append(zinfo)
+    zf.NameToInfo[zinfo.filename] = zinfo
+
+def _zip_part_path(zip_path, part):
+    zip_path = Path(zip_path)
+    return zip_path if part == 1 else zip_path.with_name(f"{zip_path.stem}.parte{part}{zip_path.suffix}")
+
+def zip_directory(src_dir, zip_path, arc_root=None, level=6, store_ext=ZIP_STORE_EXTENSIONS,
+                  split_bytes=0, workers=4, inline_max=16 * 1024 * 1024, cancel_checker=None):
+    """Compacta ``src_dir`` em ``zip_path`` comprimindo os arquivos em paralelo.
+
+    Arquivos até ``inline_max`` são comprimidos em threads (janela limitada, ordem
+    do os.walk preservada) e gravados já prontos; os maiores vão pelo
+    ``ZipFile.write`` em streaming. Extensões em ``store_ext`` não são comprimidas.
+    Com ``split_bytes`` o resultado é dividido em volumes independentes
+    (``nome.zip``, ``nome.parte2.zip``...). ZIP64 é usado quando necessário.
+    Devolve estatísticas; com cancelamento, apaga os volumes parciais e levanta CopyCanceled.
+    """
+    src_dir = Path(src_dir)
+    arc_root = Path(arc_root) if arc_root is not None else src_dir.parent
+    cancel = cancel_checker or (lambda: False)
+    stats = {"files": 0, "stored": 0, "bytes_in": 0, "bytes_out": 0, "archives": [], "seconds": 0.0}
+    t0 = time.perf_counter()
+
+    def walk():
+        for root, dirs, files in os.walk(src_dir):
+            for name in files:
+                absfile = Path(root) / name
+                yield absfile, absfile.relative_to(arc_root).as_posix(), absfile.suffix.lower() in store_ext
+
+    state = {"part": 0, "zf": None}
+
+    def archive(next_size):
+        zf = state["zf"]
+        if zf is not None and split_bytes and zf.filelist and zf.start_dir + next_size > split_bytes:
+            zf.close()
+            zf = None
+        if zf is None:
+            state["part"] += 1
+            path = _zip_part_path(zip_path, state["part"])
+            zf = state["zf"] = zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED, allowZip64=True, compresslevel=level)
+            stats["archives"].append(str(path))
+        return zf
+
+    def account(zinfo):
+        stats["files"] += 1
+        stats["stored"] += zinfo.compress_type == zipfile.ZIP_STORED
+        stats["bytes_in"] += zinfo.file_size
+        stats["bytes_out"] += zinfo.compress_size
+
+    def add_ready(fut):
+        zinfo, payload = fut.result()
+        _write_raw_member(archive(len(payload)), zinfo, payload)
+        account(zinfo)
+
+    def add_streamed(absfile, arcname, size, store):
+        zf = archive(size)
+        zf.write(absfile, arcname, zipfile.ZIP_STORED if store else zipfile.ZIP_DEFLATED)
+        account(zf.filelist[-1])
+
+    window = max(1, workers) * 2
+    pending = deque()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            for absfile, arcname, store in walk():
+                if cancel():
+                    raise CopyCanceled(str(zip_path))
+                try:
+                    size = absfile.stat().st_size
+                except OSError:
+                    continue
+                if size > inline_max:
+                    # grande: espera os anteriores (ordem) e grava em streaming
+                    while pending:
+                        add_ready(pending.popleft())
+                    add_streamed(absfile, arcname, size, store)
+                    continue
+                pending.append(pool.submit(_deflate_member, absfile, arcname, level, store))
+                while len(pending) >= window or (pending and pending[0].done()):
+                    add_ready(pending.popleft())
+            while pending:
+                if cancel():
+                    raise CopyCanceled(str(zip_path))
+                add_ready(pending.popleft())
+    except BaseException:
+        for fut in pending:
+            fut.cancel()
+        if state["zf"] is not None:
+            state["zf"].close()
+        for path in stats["archives"]:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+        raise
+    if state["zf"] is None:
+        archive(0)  # destino vazio: gera um ZIP vazio, como antes
+    state["zf"].close()
+    stats["seconds"] = time.perf_counter() - t0
+    return stats
+
+# Pasta de cache da aplicação (índices persistidos entre execuções)
+CACHE_DIR = Path.home() / ".gaal"
+
+def _cache_file(prefix, key, ext):
+    digest = hashlib.sha1(str(key).encode("utf-8")).hexdigest()[:16]
+    return CACHE_DIR / f"{prefix}_{digest}.{ext}"
 
 def buscar_subpasta(destino, nome, recursivo=True):
     destino = Path(destino)
@@ -46,33 +471,759 @@ def buscar_subpasta(destino, nome, recursivo=True):
                 matches.append(p)
     return matches
 
+class SubfolderIndex:
+    """Índice nome → [pastas] do destino, montado uma vez por execução.
+
+    Substitui o ``rglob`` de ``buscar_subpasta`` a cada arquivo. As pastas criadas
+    durante a execução entram via ``add``; é seguro entre as threads do pool.
+    Com ``persist=True`` o índice é salvo em CACHE_DIR e, na próxima execução,
+    só as pastas cujo mtime mudou são relidas.
+    """
+
+    def __init__(self, root, persist=False):
+        self.root = Path(root)
+        self.persist = persist
+        self.cache_path = _cache_file("subpastas", self.root.resolve(), "json") if persist else None
+        self._lock = threading.Lock()
+        self._built = False
+        self._by_name = {}      # nome -> [Path] (ordem igual à do rglob)
+        self._children = {}     # str(pasta) -> [mtime_ns, [[nome, é_link], ...]]
+        self._dirty = False
+
+    def _scan(self, d, cached):
+        key = str(d)
+        try:
+            mtime = os.stat(d).st_mtime_ns
+        except OSError:
+            return []
+        entry = cached.get(key)
+        if entry and entry[0] == mtime:
+            children = entry[1]
+        else:
+            children = []
+            try:
+                with os.scandir(d) as it:
+                    for e in it:
+                        try:
+                            if e.is_dir():
+                                children.append([e.name, e.is_symlink()])
+                        except OSError:
+                            continue
+            except OSError:
+                return []
+            self._dirty = True
+        self._children[key] = [mtime, children]
+        return children
+
+    def _build(self):
+        cached = {}
+        if self.cache_path and self.cache_path.exists():
+            try:
+                with self.cache_path.open("r", encoding="utf-8") as fh:
+                    data = json.load(fh)
+                if data.get("root") == str(self.root):
+                    cached = data.get("dirs", {})
+            except Exception:
+                cached = {}
+        if self.root.is_dir():
+            # pré-ordem: filhos de cada pasta, depois desce em cada um (mesma ordem do rglob)
+            stack = [self.root]
+            while stack:
+                d = stack.pop()
+                children = self._scan(d, cached)
+                subdirs = []
+                for name, is_link in children:
+                    p = d / name
+                    self._by_name.setdefault(name, []).append(p)
+                    if not is_link:
+                        subdirs.append(p)
+                stack.extend(reversed(subdirs))
+        self._built = True
+
+    def find(self, nome, recursivo=True):
+        with self._lock:
+            if not self._built:
+                self._build()
+            found = list(self._by_name.get(nome, ()))
+        if not recursivo:
+            found = [p for p in found if p.parent == self.root]
+        return found
+
+    def add(self, path):
+        """Registra ``path`` (e pastas intermediárias) criadas sob o destino."""
+        path = Path(path)
+        with self._lock:
+            if not self._built or str(path) in self._children:
+                return
+            try:
+                rel = path.relative_to(self.root)
+            except ValueError:
+                return
+            d = self.root
+            for part in rel.parts:
+                parent, d = d, d / part
+                if str(d) in self._children:
+                    continue
+                self._by_name.setdefault(part, []).append(d)
+                self._children[str(d)] = [None, []]
+                entry = self._children.get(str(parent))
+                if entry is not None:
+                    entry[1].append([part, False])
+                    try:
+                        entry[0] = os.stat(parent).st_mtime_ns
+                    except OSError:
+                        entry[0] = None
+                self._dirty = True
+
+    def save(self):
+        if not (self.cache_path and self._built and self._dirty):
+            return
+        with self._lock:
+            data = {"root": str(self.root), "dirs": self._children}
+            try:
+                self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.cache_path.with_suffix(".tmp")
+                with tmp.open("w", encoding="utf-8") as fh:
+                    json.dump(data, fh)
+                os.replace(tmp, self.cache_path)
+            except OSError:
+                pass
+
+def file_hash(path, chunk_size=COPY_CHUNK, opener=None):
+    """Hash do conteúdo (blake2b) lido em blocos. ``opener`` (chamável que devolve o
+    arquivo binário aberto) substitui ``open(path)``, p.ex. para membros de ZIP."""
+    h = hashlib.blake2b(digest_size=16)
+    with (opener() if opener is not None else open(path, "rb")) as fh:
+        for block in iter(lambda: fh.read(chunk_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+class RunManifest:
+    """Manifesto persistente (SQLite) das transferências feitas para um destino.
+
+    Chave (origem, destino); guarda tamanho/mtime da origem (e hash opcional do
+    conteúdo) e tamanho/mtime do arquivo gravado. Na execução seguinte,
+    ``unchanged`` diz se os dois lados continuam iguais. As gravações são
+    acumuladas e confirmadas em lotes; é seguro entre as threads do pool.
+    """
+
+    POLICIES = ("overwrite", "skip_unchanged", "newer")
+
+    def __init__(self, path, use_hash=False, batch=500):
+        self.path = Path(path)
+        self.use_hash = use_hash
+        self.batch = batch
+        self._lock = threading.Lock()
+        self._pending = []
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " src TEXT NOT NULL, dst TEXT NOT NULL, size INTEGER, mtime REAL, hash TEXT,"
+            " dst_size INTEGER, dst_mtime REAL, PRIMARY KEY (src, dst))"
+        )
+        self._db.commit()
+
+    @classmethod
+    def for_destination(cls, destino, use_hash=False):
+        """Manifesto padrão de um destino, em CACHE_DIR."""
+        return cls(_cache_file("manifesto", Path(destino).resolve(), "sqlite"), use_hash)
+
+    def unchanged(self, src, dst, size, mtime, opener=None):
+        """True se ``src`` já foi gravado em ``dst`` e nenhum dos dois mudou desde então.
+        ``opener`` lê a origem quando ela não é um arquivo no disco (ver ``file_hash``)."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT size, mtime, hash, dst_size, dst_mtime FROM files WHERE src = ? AND dst = ?",
+                (str(src), str(dst))).fetchone()
+        if row is None:
+            return False
+        old_size, old_mtime, old_hash, dst_size, dst_mtime = row
+        try:
+            st = os.stat(dst)
+        except OSError:
+            return False
+        if st.st_size != dst_size or st.st_mtime != dst_mtime or size != old_size:
+            return False
+        if mtime == old_mtime:
+            return True
+        # mtime mudou mas o tamanho não: com hash, confere se o conteúdo é o mesmo
+        return bool(self.use_hash and old_hash and file_hash(src, opener=opener) == old_hash)
+
+    def record(self, src, dst, size, mtime):
+        """Registra a transferência ``src`` → ``dst`` (chamar depois de gravar ``dst``)."""
+        try:
+            st = os.stat(dst)
+        except OSError:
+            return
+        digest = file_hash(dst) if self.use_hash else None
+        with self._lock:
+            self._pending.append((str(src), str(dst), size, mtime, digest, st.st_size, st.st_mtime))
+            if len(self._pending) >= self.batch:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if self._pending:
+            self._db.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)", self._pending)
+            self._db.commit()
+            self._pending.clear()
+
+    def close(self):
+        with self._lock:
+            self._flush_locked()
+            self._db.close()
+
+class RunJournal:
+    """Diário da última execução (JSON Lines), para retomar após cancelamento ou queda.
+
+    1ª linha: ``{"config": cfg}``; depois uma linha por unidade de trabalho
+    concluída, ``{"id": uid, "destinos": [...]}``; ao terminar sem cancelamento,
+    ``{"fim": ...}``. As linhas ficam em buffer e vão ao disco (flush + fsync)
+    a cada ``batch`` unidades ou ``interval`` segundos, nunca uma por arquivo.
+    """
+
+    def __init__(self, path=None, batch=256, interval=2.0):
+        self.path = Path(path) if path else CACHE_DIR / "ultima_execucao.jsonl"
+        self.batch = batch
+        self.interval = interval
+        self._fh = None
+        self._buffer = []
+        self._last_sync = time.monotonic()
+
+    @staticmethod
+    def _read(path):
+        cfg, done, finished = None, set(), False
+        with open(path, "r", encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue  # última linha truncada por uma queda
+                if "id" in rec:
+                    done.add(rec["id"])
+                elif "config" in rec:
+                    cfg = rec["config"]
+                elif "fim" in rec:
+                    finished = True
+        return cfg, done, finished
+
+    @classmethod
+    def load_last(cls, path=None):
+        """``(config, ids_concluídos)`` da última execução, se ela ficou pela metade; senão None."""
+        journal = cls(path)
+        try:
+            cfg, done, finished = cls._read(journal.path)
+        except OSError:
+            return None
+        if cfg is None or finished:
+            return None
+        return cfg, done
+
+    def start(self, cfg):
+        """Começa um diário novo (descarta o anterior)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = open(self.path, "w", encoding="utf-8")
+        self._buffer.append(json.dumps({"config": cfg, "inicio": datetime.now().isoformat()}, ensure_ascii=False))
+        self.flush()
+
+    def resume(self):
+        """Reabre o diário existente para continuar; devolve os ids já concluídos."""
+        _, done, _ = self._read(self.path)
+        self._fh = open(self.path, "a", encoding="utf-8")
+        return done
+
+    def add(self, uid, destinos):
+        self._buffer.append(json.dumps({"id": uid, "destinos": destinos}, ensure_ascii=False))
+        if len(self._buffer) >= self.batch or time.monotonic() - self._last_sync >= self.interval:
+            self.flush()
+
+    def flush(self):
+        if self._fh is None or not self._buffer:
+            return
+        self._fh.write("\n".join(self._buffer) + "\n")
+        self._buffer.clear()
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+        self._last_sync = time.monotonic()
+
+    def close(self, finished=False):
+        if self._fh is None:
+            return
+        if finished:
+            self._buffer.append(json.dumps({"fim": datetime.now().isoformat()}))
+        self.flush()
+        self._fh.close()
+        self._fh = None
+
+class ExpressionError(ValueError):
+    """Erro de sintaxe na expressão lógica de condições (detectado na configuração)."""
+
+# !Cond!  |  {Cond}  |  "literal"  |  & | ( )
+_EXPR_TOKEN = re.compile(r'!([^!]+)!|\{([^{}]+)\}|"([^"]+)"|([&|()])')
+
+class _AnyText:
+    """Texto que "contém" qualquer literal (limite superior para literais)."""
+    def __contains__(self, item):
+        return True
+
 class BooleanConditionEngine:
-    
+    """Compila a expressão uma única vez numa árvore de closures.
+
+    A avaliação faz curto-circuito em & e |, e cada condição só é testada
+    (via ``md``) quando a lógica realmente precisa do seu valor.
+    """
+
     def __init__(self, names, expr):
         self.names = names
         self.expr = expr
+        self.tree = self._parse(expr or "")
+        self.conditions = self._collect_conditions(self.tree)
+        unknown = sorted(self.conditions - set(names))
+        if unknown:
+            raise ExpressionError(f"Condição desconhecida na expressão: {', '.join(unknown)}")
+        self._fn = self._compile(self.tree) if self.tree is not None else None
+
+    # ---------- parser ----------
+    @staticmethod
+    def _tokenize(expr):
+        tokens = []
+        pos = 0
+        while pos < len(expr):
+            if expr[pos].isspace():
+                pos += 1
+                continue
+            m = _EXPR_TOKEN.match(expr, pos)
+            if not m:
+                raise ExpressionError(f"Trecho inválido na posição {pos + 1}: {expr[pos:pos + 10]!r}")
+            cond, neg, lit, op = m.groups()
+            if cond is not None:
+                tokens.append(("cond", cond, m.group(0)))
+            elif neg is not None:
+                tokens.append(("neg", neg, m.group(0)))
+            elif lit is not None:
+                tokens.append(("lit", lit.lower(), m.group(0)))
+            else:
+                tokens.append((op, op, op))
+            pos = m.end()
+        return tokens
+
+    def _parse(self, expr):
+        tokens = self._tokenize(expr)
+        if not tokens:
+            return None
+        pos = 0
+
+        def peek():
+            return tokens[pos][0] if pos < len(tokens) else None
+
+        def parse_or():
+            nonlocal pos
+            node = parse_and()
+            while peek() == "|":
+                pos += 1
+                node = ("or", node, parse_and())
+            return node
+
+        def parse_and():
+            nonlocal pos
+            node = parse_atom()
+            while peek() == "&":
+                pos += 1
+                node = ("and", node, parse_atom())
+            return node
+
+        def parse_atom():
+            nonlocal pos
+            kind = peek()
+            if kind is None:
+                raise ExpressionError("Expressão incompleta: falta um operando no final.")
+            if kind == "(":
+                pos += 1
+                node = parse_or()
+                if peek() != ")":
+                    raise ExpressionError("Parêntese '(' sem fechamento.")
+                pos += 1
+                return node
+            if kind in ("cond", "neg", "lit"):
+                node = tokens[pos][:2]
+                pos += 1
+                return node
+            raise ExpressionError(f"Operador '{kind}' fora de lugar.")
+
+        tree = parse_or()
+        if pos != len(tokens):
+            raise ExpressionError(f"Trecho inesperado: '{tokens[pos][2]}'.")
+        return tree
+
+    @classmethod
+    def _collect_conditions(cls, node):
+        if node is None or node[0] == "lit":
+            return set()
+        if node[0] in ("cond", "neg"):
+            return {node[1]}
+        return cls._collect_conditions(node[1]) | cls._collect_conditions(node[2])
 
+    @classmethod
+    def _compile(cls, node):
+        kind = node[0]
+        if kind == "cond":
+            name = node[1]
+            return lambda test, fname: test(name)
+        if kind == "neg":
+            name = node[1]
+            return lambda test, fname: not test(name)
+        if kind == "lit":
+            lit = node[1]
+            return lambda test, fname: lit in fname
+        left, right = cls._compile(node[1]), cls._compile(node[2])
+        if kind == "and":
+            return lambda test, fname: left(test, fname) and right(test, fname)
+        return lambda test, fname: left(test, fname) or right(test, fname)
+
+    # ---------- avaliação ----------
     def evaluate(self, md, filename=""):
-        e = self.expr
-        fname = filename.lower()
-        # 1) trata literais fixos em "entre aspas"
-        for lit in re.findall(r'"([^"]+)"', e):
-            found = lit.lower() in fname
-            e = e.replace(f'"{lit}"', str(found))
-        # 2) substitui !Cond! → True/False
-        for k, v in md.items():
-            e = e.replace(f"!{k}!", str(bool(v)))
-        # 3) negações {Cond}
-        def neg(m):
-            nome = m.group(1)
-            return "not " + str(bool(md.get(nome, False)))
-        e = re.sub(r"\{([A-Za-z0-9_]+)\}", neg, e)
-        # 4) operadores lógicos
-        e = e.replace('&', ' and ').replace('|', ' or ')
+        """``md`` pode ser um dict {condição: bool} ou uma função condição -> bool
+        (avaliada sob demanda)."""
+        if self._fn is None:
+            return False
+        if callable(md):
+            test = md
+        else:
+            test = lambda n: bool(md.get(n, False))
+        return bool(self._fn(test, filename.lower()))
+
+    def matches_without_conditions(self):
+        """True se a expressão pode ser satisfeita com todas as condições falsas
+        (negações/literais); nesse caso linhas sem nenhum token também podem casar."""
+        return self._fn is not None and bool(self._fn(lambda n: False, _AnyText()))
+
+    def evaluate_vector(self, test, lit_test):
+        """Avalia a árvore sobre arrays booleanos com ``&``/``|``/``~``.
+        ``test(condição)`` e ``lit_test(literal)`` devolvem arrays combináveis por broadcasting."""
+        if self.tree is None:
+            return np.False_
+        return self._eval_vector(self.tree, test, lit_test)
+
+    def _eval_vector(self, node, test, lit_test):
+        kind = node[0]
+        if kind == "cond":
+            return test(node[1])
+        if kind == "neg":
+            return ~test(node[1])
+        if kind == "lit":
+            return lit_test(node[1])
+        left = self._eval_vector(node[1], test, lit_test)
+        if kind == "and":
+            if not left.any():
+                return left
+            return left & self._eval_vector(node[2], test, lit_test)
+        if left.all():
+            return left
+        return left | self._eval_vector(node[2], test, lit_test)
+
+class TokenAutomaton:
+    """Autômato Aho–Corasick: uma passada sobre o texto devolve os ids de
+    todos os padrões que aparecem nele como substring."""
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        if ahocorasick is not None:
+            self._ac = ahocorasick.Automaton()
+            for pid, pat in enumerate(self.patterns):
+                self._ac.add_word(pat, pid)
+            if self.patterns:
+                self._ac.make_automaton()
+            return
+        self._ac = None
+        goto, fail, own = [{}], [0], [-1]
+        for pid, pat in enumerate(self.patterns):
+            s = 0
+            for ch in pat:
+                nxt = goto[s].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto.append({}); fail.append(0); own.append(-1)
+                    goto[s][ch] = nxt
+                s = nxt
+            own[s] = pid
+        # BFS: links de falha e de saída (próximo estado com padrão na cadeia de falhas)
+        out = [0] * len(goto)
+        queue = list(goto[0].values())
+        for r in queue:
+            for ch, u in goto[r].items():
+                queue.append(u)
+                f = fail[r]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[u] = goto[f].get(ch, 0)
+                out[u] = fail[u] if own[fail[u]] >= 0 else out[fail[u]]
+        self._goto, self._fail, self._own, self._out = goto, fail, own, out
+
+    def find(self, text):
+        if not self.patterns or not text:
+            return set()
+        if self._ac is not None:
+            return {pid for _, pid in self._ac.iter(text)}
+        goto, fail, own, out = self._goto, self._fail, self._own, self._out
+        found = set()
+        s = 0
+        for ch in text:
+            while s and ch not in goto[s]:
+                s = fail[s]
+            s = goto[s].get(ch, 0)
+            t = s if own[s] >= 0 else out[s]
+            while t:
+                found.add(own[t])
+                t = out[t]
+        return found
+
+class ConditionIndex:
+    """Índice dos valores das colunas mapeadas da planilha.
+
+    Tokens só com dígitos (CPF, contrato, valores) vão para um autômato que
+    percorre os dígitos do nome do arquivo; os demais para um autômato sobre o
+    nome em minúsculas. ``lookup`` devolve {linha: {condições presentes}}.
+    """
+
+    def __init__(self, df, cols, names):
+        postings = {"text": {}, "digits": {}}
+        for n in names:
+            col = cols.get(n)
+            if col is None or col not in df.columns:
+                continue
+            for i, cell in enumerate(df[col].tolist()):
+                if cell is None or (isinstance(cell, float) and cell != cell):
+                    continue  # célula vazia (NaN) nunca casa
+                kind, key = ExcelConditionEngine._token_key(cell)
+                if key:
+                    postings[kind].setdefault(key, []).append((i, n))
+        self._postings = {}
+        self._automata = {}
+        for kind, table in postings.items():
+            keys = list(table)
+            self._automata[kind] = TokenAutomaton(keys)
+            self._postings[kind] = [table[k] for k in keys]
+
+    def lookup(self, filename_lower):
+        hits = {}
+        texts = {"text": filename_lower, "digits": ExcelConditionEngine._digits(filename_lower)}
+        for kind, text in texts.items():
+            postings = self._postings[kind]
+            for pid in self._automata[kind].find(text):
+                for row, n in postings[pid]:
+                    hits.setdefault(row, set()).add(n)
+        return hits
+
+class VectorMatcher:
+    """Casamento coluna a coluna com NumPy, alternativa ao índice quando a
+    expressão depende muito de negações. Para um lote de arquivos produz a
+    matriz arquivos × linhas em poucas operações vetorizadas."""
+
+    def __init__(self, df, cols, names, batch_cells=4_000_000):
+        self.rows = len(df)
+        self.batch_cells = batch_cells
+        self._cols = {}
+        for n in names:
+            col = cols.get(n)
+            if col is None or col not in df.columns:
+                continue
+            text, digits = [], []
+            for cell in df[col].tolist():
+                kind, key = ("text", "")
+                if cell is not None and not (isinstance(cell, float) and cell != cell):
+                    kind, key = ExcelConditionEngine._token_key(cell)
+                text.append(key if kind == "text" else "")
+                digits.append(key if kind == "digits" else "")
+            text, digits = np.array(text, dtype=str), np.array(digits, dtype=str)
+            self._cols[n] = (np.flatnonzero(text != ""), text[text != ""],
+                             np.flatnonzero(digits != ""), digits[digits != ""])
+
+    def batch_size(self):
+        return max(1, self.batch_cells // max(self.rows, 1))
+
+    def match_matrix(self, filenames_lower, boolean):
+        """Matriz booleana (len(filenames), linhas) para um lote de nomes já em minúsculas."""
+        b = len(filenames_lower)
+        names = np.array(filenames_lower, dtype=str)[:, None]
+        digits = np.array([ExcelConditionEngine._digits(f) for f in filenames_lower], dtype=str)[:, None]
+        cache = {}
+
+        def test(n):
+            if n not in cache:
+                m = np.zeros((b, self.rows), dtype=bool)
+                if n in self._cols:
+                    t_idx, t_vals, d_idx, d_vals = self._cols[n]
+                    if len(t_idx):
+                        m[:, t_idx] = np.char.find(names, t_vals) >= 0
+                    if len(d_idx):
+                        m[:, d_idx] = np.char.find(digits, d_vals) >= 0
+                cache[n] = m
+            return cache[n]
+
+        def lit_test(lit):
+            return (np.char.find(names, lit) >= 0)
+
+        res = boolean.evaluate_vector(test, lit_test)
+        return np.broadcast_to(res, (b, self.rows))
+
+class MatchResult:
+    """Casamento de um arquivo com a planilha, calculado uma vez e compartilhado
+    por roteamento, subpasta das principais, renomeação e relatório."""
+    __slots__ = ("filename", "rows", "engine")
+
+    def __init__(self, filename, rows, engine):
+        self.filename = filename
+        self.rows = rows            # posições (iloc) das linhas que casaram, em ordem
+        self.engine = engine
+
+    def __bool__(self):
+        return bool(self.rows)
+
+    def row(self, pos):
+        return self.engine.df.iloc[pos]
+
+    @property
+    def first(self):
+        return self.row(self.rows[0]) if self.rows else None
+
+    def values(self, pos):
+        """{condição: valor da célula} de uma linha (usado na renomeação)."""
+        row = self.row(pos)
+        return {nome: str(row[col]).strip() for nome, col in self.engine.cols.items() if col in row}
+
+    def subfolder(self, pos, principais, sep):
+        row = self.row(pos)
+        return sep.join(str(row[self.engine.cols[n]]).strip() for n in principais)
+
+    @staticmethod
+    def excel_lines(positions):
+        """Números de linha como aparecem no Excel (cabeçalho na linha 1)."""
+        return ", ".join(str(p + 2) for p in positions)
+
+# ---------- fonte da planilha de condições ----------
+
+SQLITE_EXTENSIONS = (".sqlite", ".sqlite3", ".db")
+CONDITION_SOURCE_FILTER = "Planilha de condições (*.xlsx *.xlsm *.xls *.csv *.parquet *.sqlite *.sqlite3 *.db)"
+
+_HEADER_CACHE = {}
+
+def _source_stamp(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+def _as_text(df):
+    """Mesmo resultado de ``read_excel(dtype=str)``: texto, e NaN onde está vazio."""
+    return df.apply(lambda s: s.where(s.isna(), s.astype(str))) if len(df.columns) else df
+
+def _sqlite_table(conn, table):
+    if table:
+        return table
+    row = conn.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY rowid LIMIT 1").fetchone()
+    if row is None:
+        raise ValueError("O banco SQLite não tem nenhuma tabela.")
+    return row[0]
+
+def _csv_options(path):
+    """Codificação e separador (vírgula, ponto e vírgula, tab...) de um CSV."""
+    for encoding in ("utf-8-sig", "latin-1"):
+        try:
+            with open(path, "r", encoding=encoding, newline="") as fh:
+                sample = fh.read(64 * 1024)
+            break
+        except UnicodeDecodeError:
+            continue
+    try:
+        sep = csv.Sniffer().sniff(sample.splitlines()[0] if sample else ",", delimiters=",;\t|").delimiter
+    except csv.Error:
+        sep = ","
+    return {"encoding": encoding, "sep": sep}
+
+def _read_condition_source(path, columns=None, table=None, nrows=None):
+    """Lê a planilha de condições (xlsx/xls, CSV, Parquet ou SQLite) como texto,
+    só com as colunas pedidas (``None`` = todas)."""
+    path = Path(path)
+    ext = path.suffix.lower()
+    wanted = None if columns is None else set(columns)
+    usecols = None if wanted is None else (lambda c: c in wanted)
+    if ext == ".csv":
+        return pd.read_csv(path, dtype=str, usecols=usecols, nrows=nrows, **_csv_options(path))
+    if ext == ".parquet":
+        import pyarrow.parquet as pq
+        names = pq.read_schema(path).names
+        cols = names if wanted is None else [c for c in names if c in wanted]
+        if nrows == 0:
+            return pd.DataFrame(columns=cols)
+        return _as_text(pd.read_parquet(path, columns=cols))
+    if ext in SQLITE_EXTENSIONS:
+        conn = sqlite3.connect(f"file:{path.as_posix()}?mode=ro", uri=True)
         try:
-            return eval(e)
+            table = _sqlite_table(conn, table)
+            names = [r[1] for r in conn.execute(f'PRAGMA table_info("{table}")')]
+            cols = names if wanted is None else [c for c in names if c in wanted]
+            if not cols:
+                return pd.DataFrame(columns=cols)
+            sql = f'SELECT {", ".join(chr(34) + c + chr(34) for c in cols)} FROM "{table}" ORDER BY rowid'
+            if nrows is not None:
+                sql += f" LIMIT {int(nrows)}"
+            return _as_text(pd.read_sql_query(sql, conn))
+        finally:
+            conn.close()
+    # Excel: lê de uma cópia, para não esbarrar no arquivo aberto (e travado) no Excel
+    tmp = Path(tempfile.mkdtemp()) / path.name
+    try:
+        shutil.copy2(path, tmp)
+        return pd.read_excel(tmp, dtype=str, usecols=usecols, nrows=nrows)
+    finally:
+        shutil.rmtree(tmp.parent, ignore_errors=True)
+
+def condition_headers(path, table=None):
+    """Cabeçalho da planilha de condições, lido uma vez por versão do arquivo
+    (caminho + mtime + tamanho) e reaproveitado pela interface."""
+    stamp = _source_stamp(path)
+    key = (str(Path(path).resolve()), table)
+    cached = _HEADER_CACHE.get(key)
+    if cached is not None and cached[0] == stamp:
+        return list(cached[1])
+    headers = [str(c) for c in _read_condition_source(path, table=table, nrows=0).columns]
+    _HEADER_CACHE[key] = (stamp, headers)
+    return list(headers)
+
+def load_condition_table(path, columns=None, table=None, cache=True):
+    """Planilha de condições como DataFrame de texto, só com ``columns``.
+
+    O resultado fica em cache (pickle em ``CACHE_DIR``) junto com o mtime e o
+    tamanho do arquivo: enquanto a planilha não muda, as próximas execuções não
+    voltam a interpretar o xlsx."""
+    path = Path(path)
+    stamp = _source_stamp(path)
+    cols = sorted(set(columns)) if columns is not None else None
+    # a versão do pandas entra na chave: um pickle de outra versão pode nem carregar
+    cache_path = _cache_file("condicoes", (str(path.resolve()), table, cols, pd.__version__), "pkl")
+    if cache:
+        try:
+            with open(cache_path, "rb") as fh:
+                saved_stamp, df = pickle.load(fh)
+            if saved_stamp == stamp:
+                return df
+        except FileNotFoundError:
+            pass
         except Exception:
-            return False
+            # cache ilegível (truncado, de outra versão...): descarta e relê a planilha
+            try:
+                cache_path.unlink()
+            except OSError:
+                pass
+    df = _read_condition_source(path, cols, table)
+    if cache:
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp = cache_path.with_suffix(".tmp")
+            with open(tmp, "wb") as fh:
+                pickle.dump((stamp, df), fh, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, cache_path)
+        except OSError:
+            pass  # sem cache: só perde a aceleração da próxima execução
+    return df
 
 class ExcelConditionEngine:
     
@@ -80,131 +1231,186 @@ class ExcelConditionEngine:
     def _digits(s: str) -> str:
         return re.sub(r'\D+', '', str(s))
 
+    @staticmethod
+    def _token_key(token):
+        """Normaliza um valor da planilha: ("digits", só dígitos) quando tem
+        dígitos e nenhuma letra, senão ("text", valor em minúsculas)."""
+        t = str(token).strip().lower()
+        if re.search(r'\d', t) and not re.search(r'[a-zA-Z]', t):
+            return "digits", ExcelConditionEngine._digits(t)
+        return "text", t
+
     def _token_in_filename(self, token: str, filename: str) -> bool:
         """Compara token com o nome do arquivo, tolerando pontuação/locale.
         - Se tem dígitos e não tem letras → compara por dígitos apenas (CPF, contrato, dinheiro).
         - Caso contrário → substring case-insensitive normal.
         """
-        t = str(token).strip().lower()
-        if not t:
+        kind, key = self._token_key(token)
+        if not key:
             return False
-        has_digit = bool(re.search(r'\d', t))
-        has_alpha = bool(re.search(r'[a-zA-Z]', t))
-
-        if has_digit and not has_alpha:
-            return self._digits(t) in self._digits(filename)
-        return t in filename
+        if kind == "digits":
+            return key in self._digits(filename)
+        return key in filename
 
-    def __init__(self, path, cols, prims, expr):
+    def __init__(self, path, cols, prims, expr, engine="auto", cache_size=4096, df=None, table=None, cache=True):
+        """``engine``: "index" (autômato de tokens), "vector" (NumPy em lote) ou
+        "auto" (vetorizado só quando linhas sem tokens podem casar).
+        ``df`` permite reaproveitar uma planilha já carregada (processos de casamento).
+        ``path`` pode ser xlsx/xls, CSV, Parquet ou SQLite (``table``; padrão: a primeira);
+        ``cache`` guarda a planilha interpretada (ver ``load_condition_table``)."""
         self.path = Path(path)
+        self.table = table
+        self.use_cache = cache
         self.cols = cols
         self.boolean = BooleanConditionEngine(list(cols.keys()), expr)
         self.principais = list(prims)
-        self._load()
+        if engine == "auto":
+            engine = "vector" if self.boolean.matches_without_conditions() else "index"
+        self.engine = engine
+        self._prefetched = {}
+        self._match_cached = lru_cache(maxsize=cache_size)(self._match)
+        if df is None:
+            self._load()
+        else:
+            self.df = df
+        self.index = self.vector = None
+        if self.df is not None:
+            if engine == "vector":
+                self.vector = VectorMatcher(self.df, self.cols, self.boolean.conditions)
+            else:
+                self.index = ConditionIndex(self.df, self.cols, self.boolean.conditions)
 
     def _load(self):
+        # só as colunas mapeadas (quando o mapeamento é por nome de coluna)
+        mapped = list(self.cols.values())
+        columns = mapped if mapped and all(isinstance(c, str) for c in mapped) else None
         try:
-            tmp = Path(tempfile.mkdtemp()) / self.path.name
-            shutil.copy2(self.path, tmp)
-            self.df = pd.read_excel(tmp, dtype=str)
+            self.df = load_condition_table(self.path, columns, self.table, self.use_cache)
         except Exception:
             self.df = None
-        finally:
-            shutil.rmtree(tmp.parent, ignore_errors=True)
 
-    def evaluate(self, filename):
+    def iter_matching_indices(self, filename):
+        """Posições (em ordem) das linhas cuja expressão é satisfeita pelo arquivo.
+
+        Só as linhas com algum token presente no nome precisam ser avaliadas;
+        as demais só casam se a expressão for verdadeira sem nenhuma condição
+        (ex.: negações ou literais), o que é testado uma única vez.
+        """
         if self.df is None or len(self.df) == 0:
-            return False
-        filename_lower = filename.lower()
-        for idx, row in self.df.iterrows():
-            md = {}
-            for n, col in self.cols.items():
-                try:
-                    val = str(row[col]).strip() if col in row else ""
-                    md[n] = self._token_in_filename(val, filename_lower) if val else False
-                except Exception:
-                    md[n] = False
-            if self.boolean.evaluate(md, filename_lower):
-                return True
-        return False
+            return
+        fname = filename.lower()
+        cached = self._prefetched.pop(fname, None)
+        if cached is not None:
+            yield from cached
+            return
+        if self.vector is not None:
+            yield from np.flatnonzero(self.vector.match_matrix([fname], self.boolean)[0]).tolist()
+            return
+        hits = self.index.lookup(fname)
+        if self.boolean.evaluate(lambda n: False, fname):
+            for i in range(len(self.df)):
+                h = hits.get(i)
+                if h is None or self.boolean.evaluate(h.__contains__, fname):
+                    yield i
+            return
+        for i in sorted(hits):
+            if self.boolean.evaluate(hits[i].__contains__, fname):
+                yield i
+
+    def prefetch(self, filenames):
+        """No modo vetorizado, casa os arquivos em lotes (uma matriz arquivos × linhas
+        por lote) e guarda o resultado para as consultas seguintes."""
+        if self.vector is None or self.df is None or len(self.df) == 0:
+            return
+        names = list(dict.fromkeys(f.lower() for f in filenames))
+        step = self.vector.batch_size()
+        for start in range(0, len(names), step):
+            batch = names[start:start + step]
+            matrix = self.vector.match_matrix(batch, self.boolean)
+            for fname, row in zip(batch, matrix):
+                self._prefetched[fname] = np.flatnonzero(row).tolist()
+
+    def prime(self, results):
+        """Guarda resultados calculados fora (ex.: processos): pares (nome, linhas)."""
+        for filename, rows in results:
+            self._prefetched[filename.lower()] = rows
+
+    def worker_args(self):
+        """Argumentos para recriar o motor num processo de casamento (enviados uma vez)."""
+        return ("excel", (str(self.path), self.cols, self.principais, self.boolean.expr),
+                {"engine": self.engine, "df": self.df, "table": self.table})
+
+    def _match(self, filename_lower):
+        return MatchResult(filename_lower, list(self.iter_matching_indices(filename_lower)), self)
+
+    def match(self, filename):
+        """Resultado memoizado (LRU por nome) do casamento deste arquivo."""
+        fname = filename.lower()
+        result = self._match_cached(fname)
+        # nome repetido num lote posterior: o LRU respondeu e o pré-cálculo sobrou
+        self._prefetched.pop(fname, None)
+        return result
+
+    def evaluate(self, filename):
+        return bool(self.match(filename))
 
     def get_principais_values(self, filename, sep="_"):
-        if self.df is None or len(self.df) == 0:
+        row = self.find_matching_row(filename)
+        if row is None:
             return None
-        filename_lower = filename.lower()
-        for idx, row in self.df.iterrows():
-            md = {}
-            for n, col in self.cols.items():
-                try:
-                    val = str(row[col]).strip() if col in row else ""
-                    md[n] = self._token_in_filename(val, filename_lower) if val else False
-                except Exception:
-                    md[n] = False
-            if self.boolean.evaluate(md, filename_lower):
-                vals = []
-                for n in self.principais:
-                    col = self.cols.get(n, None)
-                    if col is not None and col in row:
-                        vals.append(str(row[col]).strip())
-                return sep.join(vals) if vals else None
-        return None
+        vals = []
+        for n in self.principais:
+            col = self.cols.get(n, None)
+            if col is not None and col in row:
+                vals.append(str(row[col]).strip())
+        return sep.join(vals) if vals else None
 
     def find_matching_row(self, filename):
         """Retorna a primeira linha do Excel que satisfaz a expressão para este arquivo."""
-        if self.df is None or len(self.df) == 0:
-            return None
-        fname = filename.lower()
-
-        for _, row in self.df.iterrows():
-            md = {}
-            for n, col in self.cols.items():
-                raw = str(row[col]).strip() if col in row else ""
-                md[n] = self._token_in_filename(raw, fname)  # usa normalização (abaixo)
-            if self.boolean.evaluate(md, fname):
-                return row
-        return None
+        return self.match(filename).first
 
     def all_matching_rows(self, filename):
         """
         Retorna todas as linhas do excel que são compatíveis com o arquivo (baseado na expressão e colunas)
         """
-        if self.df is None or len(self.df) == 0:
-            return []
-        filename_lower = filename.lower()
-        matches = []
-        for idx, row in self.df.iterrows():
-            md = {}
-            for n, col in self.cols.items():
-                try:
-                    val = str(row[col]).strip() if col in row else ""
-                    md[n] = self._token_in_filename(val, filename_lower) if val else False
-                except Exception:
-                    md[n] = False
-            if self.boolean.evaluate(md, filename_lower):
-                matches.append(row)
-        return matches
+        m = self.match(filename)
+        return [m.row(i) for i in m.rows]
 
 class FolderConditionEngine:
     
-    def __init__(self, base, cols, prims, sep, expr):
+    def __init__(self, base, cols, prims, sep, expr, subs=None):
         self.base = Path(base)
         self.cols = cols
         self.boolean = BooleanConditionEngine(list(cols.keys()), expr)
         self.sep = sep
-        self.subs = [d.name for d in self.base.iterdir() if d.is_dir()]
+        self.subs = list(subs) if subs is not None else [d.name for d in self.base.iterdir() if d.is_dir()]
+        self._prefetched = {}
+        # tokens de cada subpasta já em minúsculas, separados uma única vez
+        self._sub_tokens = [[t.lower() for t in (sub.split(self.sep) if self.sep else [sub])] for sub in self.subs]
         self.principais = list(prims)
 
+    def prime(self, results):
+        """Guarda resultados calculados fora (ex.: processos): pares (nome, subpastas)."""
+        for filename, subs in results:
+            self._prefetched[filename] = subs
+
+    def worker_args(self):
+        """Argumentos para recriar o motor num processo de casamento (enviados uma vez)."""
+        return ("folders", (str(self.base), self.cols, self.principais, self.sep, self.boolean.expr),
+                {"subs": self.subs})
+
     def matched_subfolders(self, filename):
+        cached = self._prefetched.pop(filename, None)
+        if cached is not None:
+            return cached
         out = []
         filename_lower = filename.lower()
-        for sub_name in self.subs:
-            tok = sub_name.split(self.sep)
-            md = {}
-            for c, i in self.cols.items():
-                idx = i - 1
+        for sub_name, tok in zip(self.subs, self._sub_tokens):
+            def test(c, tok=tok):
+                idx = self.cols.get(c, 0) - 1
                 val = tok[idx] if (0 <= idx < len(tok)) else ""
-                md[c] = (val != "" and val.lower() in filename_lower)
-            if self.boolean.evaluate(md, filename_lower):
+                return val != "" and val in filename_lower
+            if self.boolean.evaluate(test, filename_lower):
                 out.append(sub_name)
         return out
 
@@ -218,10 +1424,107 @@ class FolderConditionEngine:
                 vals.append(tokens[idx-1])
         return self.sep.join(vals) if vals else None
 
+class FileEntry:
+    """Item descoberto na varredura, com tamanho/mtime já lidos do DirEntry.
+
+    ``uid`` identifica o item de forma estável entre execuções (caminho de origem;
+    para membros de ZIP, ``arquivo.zip::caminho/interno``)."""
+    __slots__ = ("path", "size", "mtime", "is_dir", "uid", "zip")
+
+    def __init__(self, path, size=0, mtime=0.0, is_dir=False, uid=None, zip=None):
+        self.path = path
+        self.size = size
+        self.mtime = mtime
+        self.is_dir = is_dir
+        self.uid = uid if uid is not None else str(path)
+        # membro de ZIP (fonte virtual): (ZipArchive, ZipInfo)
+        self.zip = zip
+
+    @classmethod
+    def from_path(cls, path):
+        st = os.stat(path)
+        return cls(Path(path), st.st_size, st.st_mtime, os.path.isdir(path))
+
+    def __repr__(self):
+        return f"FileEntry({str(self.path)!r}, size={self.size}, is_dir={self.is_dir})"
+
+def scan_tree(root, recursivo=True, prune=None):
+    """Percorre ``root`` com os.scandir e gera os DirEntry (filhos de cada pasta e
+    depois as subpastas, na mesma ordem do rglob). Não desce em links simbólicos.
+
+    Quem consome pode pôr em ``prune`` (set) o caminho da pasta que acabou de
+    receber para não descer nela."""
+    stack = [os.fspath(root)]
+    while stack:
+        d = stack.pop()
+        subdirs = []
+        try:
+            with os.scandir(d) as it:
+                for e in it:
+                    yield e
+                    if prune and e.path in prune:
+                        prune.discard(e.path)
+                        continue
+                    if recursivo:
+                        try:
+                            if e.is_dir(follow_symlinks=False):
+                                subdirs.append(e.path)
+                        except OSError:
+                            pass
+        except OSError:
+            continue
+        stack.extend(reversed(subdirs))
+
+class ZipArchive:
+    """ZIP de origem compartilhado pelos seus membros na fila.
+
+    Cada membro descoberto segura uma referência; o ZipFile só é aberto na
+    primeira extração e é fechado quando o último membro termina. Assim há um
+    descritor aberto por ZIP *em extração*, não por ZIP já varrido."""
+    __slots__ = ("path", "refs", "_zf", "_lock")
+
+    def __init__(self, path):
+        self.path = path
+        self.refs = 0
+        self._zf = None
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            self.refs += 1
+
+    def open(self):
+        """ZipFile aberto (reaberto sob demanda); o zipfile serializa só a leitura
+        do disco, a descompressão dos membros roda em paralelo."""
+        with self._lock:
+            if self._zf is None:
+                self._zf = zipfile.ZipFile(self.path, "r")
+            return self._zf
+
+    def release(self):
+        """Devolve uma referência; fecha o arquivo ao chegar a zero. True se zerou."""
+        with self._lock:
+            self.refs -= 1
+            if self.refs > 0:
+                return False
+            self._close()
+            return True
+
+    def close(self):
+        with self._lock:
+            self._close()
+
+    def _close(self):
+        if self._zf is not None:
+            self._zf.close()
+            self._zf = None
+
 class FileManager:
     
-    def __init__(self, origins, destino, action, extract_zips=False, recursivo=True, hierarchy=False, criar_subpasta=False, copy_dirs=False):
+    def __init__(self, origins, destino, action, extract_zips=False, recursivo=True, hierarchy=False, criar_subpasta=False, copy_dirs=False,
+                 filters=None):
         self.origins = [Path(p) for p in origins]
+        self.filters = filters if isinstance(filters, FileFilter) else FileFilter(filters)
         self.destino = Path(destino)
         self.action = action
         self.extract_zips = extract_zips
@@ -229,44 +1532,146 @@ class FileManager:
         self.hierarchy = hierarchy
         self.criar_subpasta = criar_subpasta
         self.copy_dirs = copy_dirs
-        self._temp_dirs = []
+        self.metrics = None  # RunMetrics (opcional): mede o tempo dos stat()
+        self.on_error = None  # callback(mensagem) para erros de um ZIP na varredura
+        self._zips = {}     # caminho -> ZipArchive com membros ainda pendentes
+        self._zips_lock = threading.Lock()
 
-    def collect_files(self):
-        files = set()
+    def _origins_overlap(self):
+        """True se alguma origem está contida em outra (aí é preciso deduplicar)."""
+        roots = []
+        for p in self.origins:
+            try:
+                roots.append(p.resolve())
+            except OSError:
+                roots.append(p)
+        for i, a in enumerate(roots):
+            for j, b in enumerate(roots):
+                if i != j and (a == b or b in a.parents):
+                    return True
+        return False
+
+    def _entry(self, path, stat, is_dir):
+        """Aplica os filtros (nome antes do stat) e devolve FileEntry ou None."""
+        if not self.filters.accepts_name(path.name):
+            return None
+        if self.metrics is not None:
+            t0 = time.perf_counter()
+            st = stat()
+            self.metrics.add("stat", time.perf_counter() - t0)
+        else:
+            st = stat()
+        if not self.filters.accepts_stat(st.st_size, st.st_mtime, is_dir):
+            return None
+        return FileEntry(path, st.st_size, st.st_mtime, is_dir)
+
+    def _scan_dir(self, root, recursivo, zips=True):
+        # mover pasta é mover tudo o que ela contém (move_tree): o conteúdo não entra na fila
+        prune = set() if self.copy_dirs and self.action == "move" else None
+        for e in scan_tree(root, recursivo, prune):
+            try:
+                is_file = e.is_file()
+                is_dir = not is_file and self.copy_dirs and e.is_dir()
+            except OSError:
+                continue
+            if is_file and zips and self.extract_zips and os.path.splitext(e.name)[1].lower() == ".zip":
+                # Membros dos ZIPs encontrados dentro da pasta viram fontes virtuais
+                yield from self._zip_members(Path(e.path))
+            elif is_file or is_dir:
+                try:
+                    entry = self._entry(Path(e.path), e.stat, is_dir)
+                except OSError:
+                    continue
+                if entry is not None:
+                    if is_dir and prune is not None:
+                        prune.add(e.path)
+                    yield entry
+
+    def _archive(self, zip_path):
+        key = str(zip_path)
+        with self._zips_lock:
+            archive = self._zips.get(key)
+            if archive is None:
+                archive = self._zips[key] = ZipArchive(zip_path)
+            archive.acquire()
+            return archive
+
+    def release(self, entry):
+        """Marca um item como concluído; o ZIP de origem fecha com o último membro."""
+        if entry.zip is not None:
+            self._release_archive(entry.zip[0])
+
+    def _release_archive(self, archive):
+        with self._zips_lock:
+            if archive.release() and self._zips.get(str(archive.path)) is archive:
+                del self._zips[str(archive.path)]
+
+    def _zip_members(self, zip_path):
+        """Membros do ZIP como fontes virtuais (``zip/caminho/interno``).
+
+        Nome, tamanho e data vêm do diretório central (ZipInfo), então os filtros
+        não descompactam nada; só os membros aprovados são extraídos, direto no
+        destino, durante a transferência (ver ``extract_zip_member``). Um ZIP
+        corrompido ou ilegível é informado em ``on_error`` e a varredura segue."""
+        try:
+            with zipfile.ZipFile(zip_path, "r") as zf:
+                infos = zf.infolist()
+        except (OSError, zipfile.BadZipFile) as e:
+            if self.on_error is not None:
+                self.on_error(f"Não foi possível ler o ZIP {zip_path}: {e}")
+            return
+        # a referência da própria varredura impede que o ZIP feche entre um membro e outro
+        archive = self._archive(zip_path)
+        try:
+            for info in infos:
+                parts = _zip_member_parts(info.filename)
+                # só arquivos: pastas internas não viram itens, nem com copy_dirs
+                if not parts or info.is_dir():
+                    continue
+                mtime = time.mktime(info.date_time + (0, 0, -1))
+                inner = "/".join(parts)
+                path = zip_path.joinpath(*parts)
+                if not self.filters.accepts_name(path.name):
+                    continue
+                if not self.filters.accepts_stat(info.file_size, mtime, False):
+                    continue
+                archive.acquire()
+                yield FileEntry(path, info.file_size, mtime, False, uid=f"{zip_path}::{inner}", zip=(archive, info))
+        finally:
+            self._release_archive(archive)
+
+    def iter_files(self):
+        """Gera FileEntry (arquivos e, com copy_dirs, pastas) à medida que são
+        descobertos e aprovados pelos filtros, sem materializar a árvore inteira."""
+        seen = set() if self._origins_overlap() else None
+        for entry in self._iter_origins():
+            if seen is not None:
+                if entry.path in seen:
+                    continue
+                seen.add(entry.path)
+            yield entry
+
+    def _iter_origins(self):
         for p in self.origins:
             if p.is_dir():
                 # Pega tudo dentro da pasta
-                found = list(p.rglob("*")) if self.recursivo else list(p.glob("*"))
-                for f in found:
-                    if self.extract_zips and f.is_file() and f.suffix.lower() == ".zip":
-                        # Extrai todos os ZIPs encontrados dentro da pasta
-                        tmp_dir = Path(tempfile.mkdtemp())
-                        self._temp_dirs.append(tmp_dir)
-                        with zipfile.ZipFile(f, 'r') as zip_ref:
-                            zip_ref.extractall(tmp_dir)
-                        for zf in tmp_dir.rglob("*"):
-                            if zf.is_file():
-                                files.add(zf)
-                    elif f.is_file():
-                        files.add(f)
-                    elif self.copy_dirs and f.is_dir():
-                        files.add(f)
+                yield from self._scan_dir(p, self.recursivo)
             elif p.is_file() and p.suffix.lower() == ".zip" and self.extract_zips:
-                # Se origem for um ZIP direto, extrai também
-                tmp_dir = Path(tempfile.mkdtemp())
-                self._temp_dirs.append(tmp_dir)
-                with zipfile.ZipFile(p, 'r') as zip_ref:
-                    zip_ref.extractall(tmp_dir)
-                for zf in tmp_dir.rglob("*"):
-                    if zf.is_file():
-                        files.add(zf)
+                # Se origem for um ZIP direto, seus membros também
+                yield from self._zip_members(p)
             elif p.is_file():
-                files.add(p)
-        return list(files)
+                entry = self._entry(p, p.stat, False)
+                if entry is not None:
+                    yield entry
+
+    def collect_files(self):
+        return list(self.iter_files())
 
     def cleanup(self):
-        for d in self._temp_dirs:
-            shutil.rmtree(d, ignore_errors=True)
+        with self._zips_lock:
+            for archive in self._zips.values():
+                archive.close()
+            self._zips.clear()
 
     def process_file(self, src, sub=None, hierarchy_path=None):
         destino_final = ""
@@ -285,28 +1690,209 @@ class FileManager:
                 dst_dir = dst_dir / sub
             dst_dir.mkdir(parents=True, exist_ok=True)
             if src.is_file():
-                shutil.copy2(src, dst_dir / src.name)
+                copy_file(src, dst_dir / src.name)
                 destino_final = str(dst_dir / src.name)
             elif src.is_dir():
                 # Copiar pasta (inclusive vazia)
                 dest_folder = dst_dir / src.name
-                if not dest_folder.exists():
-                    dest_folder.mkdir(parents=True, exist_ok=True)
-                for file in src.rglob("*"):
-                    if file.is_file():
-                        rel = file.relative_to(src)
-                        (dest_folder / rel.parent).mkdir(parents=True, exist_ok=True)
-                        shutil.copy2(file, dest_folder / rel)
+                copy_tree(src, dest_folder)
                 destino_final = str(dest_folder)
         except PermissionError:
             destino_final = "ERRO_PERMISSAO"
         return destino_final
 
+class RunMetrics:
+    """Métricas da execução para o ``metrics_callback`` e o perfil final.
+
+    Tempo acumulado por fase (somado entre as threads, então pode passar do tempo
+    de parede), bytes gravados, arquivos concluídos, profundidade da fila e
+    ocupação das threads. Seguro entre threads."""
+
+    PHASES = ("scan", "stat", "match", "subpasta", "transfer", "zip")
+
+    def __init__(self, workers):
+        self.workers = max(1, workers)
+        self.start = time.perf_counter()
+        self.phases = dict.fromkeys(self.PHASES, 0.0)
+        self.bytes = 0
+        self.busy = 0.0
+        self.active = 0
+        self.done = 0
+        self.discovered = 0
+        self.scanning = True
+        self.queue_depth = 0
+        self._lock = threading.Lock()
+
+    def add(self, phase, seconds, nbytes=0):
+        with self._lock:
+            self.phases[phase] += seconds
+            self.bytes += nbytes
+
+    @contextmanager
+    def phase(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - t0)
+
+    def task_started(self):
+        with self._lock:
+            self.active += 1
+
+    def task_finished(self, seconds):
+        with self._lock:
+            self.active -= 1
+            self.busy += seconds
+
+    def snapshot(self):
+        with self._lock:
+            elapsed = time.perf_counter() - self.start
+            files_s = self.done / elapsed if elapsed > 0 else 0.0
+            # durante a varredura o total ainda cresce: a ETA é só um limite inferior
+            eta = max(0, self.discovered - self.done) / files_s if files_s > 0 else None
+            return {
+                "elapsed_s": round(elapsed, 3),
+                "phases_s": {k: round(v, 4) for k, v in self.phases.items()},
+                "files_done": self.done,
+                "files_discovered": self.discovered,
+                "scanning": self.scanning,
+                "bytes": self.bytes,
+                "files_s": round(files_s, 2),
+                "mb_s": round(self.bytes / (1024 * 1024) / elapsed, 2) if elapsed > 0 else 0.0,
+                "queue_depth": self.queue_depth,
+                "workers": self.workers,
+                "workers_busy": self.active,
+                "utilization": round(self.busy / (self.workers * elapsed), 3) if elapsed > 0 else 0.0,
+                "eta_s": round(eta, 1) if eta is not None else None,
+            }
+
+class ProgressAggregator:
+    """Junta as atualizações de progresso (uma por arquivo concluído) e entrega no
+    máximo ``hz`` por segundo a ``callback(done, total, scanning, info)``.
+
+    ``info`` traz ``bytes`` gravados, ``current`` (último arquivo concluído),
+    ``files_s``/``mb_s`` (vazão dos últimos ``WINDOW`` segundos) e ``eta_s``
+    (limite inferior enquanto a varredura continua). ``flush()`` entrega sempre
+    o último estado, mesmo que tenha chegado dentro do intervalo."""
+
+    WINDOW = 5.0
+
+    def __init__(self, callback, metrics, hz=15):
+        self.callback = callback
+        self.metrics = metrics
+        self.period = 1.0 / hz if hz and hz > 0 else 0.0
+        self.current = None
+        self._state = None
+        self._pending = False
+        self._last = 0.0
+        self._samples = deque()
+
+    def update(self, done, total, scanning, current=None):
+        if current is not None:
+            self.current = current
+        self._state = (done, total, scanning)
+        self._pending = True
+        now = time.perf_counter()
+        if now - self._last >= self.period:
+            self._deliver(now)
+
+    def flush(self):
+        if self._pending:
+            self._deliver(time.perf_counter())
+
+    def _deliver(self, now):
+        done, total, scanning = self._state
+        nbytes = self.metrics.bytes
+        samples = self._samples
+        samples.append((now, done, nbytes))
+        while len(samples) > 2 and now - samples[0][0] > self.WINDOW:
+            samples.popleft()
+        t0, done0, bytes0 = samples[0]
+        if now - t0 > 0 and done > done0:
+            files_s, bytes_s = (done - done0) / (now - t0), (nbytes - bytes0) / (now - t0)
+        else:
+            elapsed = now - self.metrics.start
+            files_s = done / elapsed if elapsed > 0 else 0.0
+            bytes_s = nbytes / elapsed if elapsed > 0 else 0.0
+        eta = max(0, total - done) / files_s if files_s > 0 else None
+        info = {
+            "bytes": nbytes,
+            "current": self.current,
+            "files_s": round(files_s, 2),
+            "mb_s": round(bytes_s / (1024 * 1024), 2),
+            "eta_s": round(eta, 1) if eta is not None else None,
+        }
+        self._last = now
+        self._pending = False
+        self.callback(done, total, scanning, info)
+
+def check_config(cfg):
+    """Confere uma config (o dict de ``MainWindow.collect_config``) sem interface:
+    devolve a lista de problemas encontrados, vazia se ela pode ser executada.
+    Filtros e expressão lógica são validados depois, ao montar o ``Executor``."""
+    problemas = []
+    origens = cfg.get("origens") or []
+    if not origens:
+        problemas.append("Informe ao menos uma origem.")
+    for o in origens:
+        if not Path(o).exists():
+            problemas.append(f"Origem inválida: {o}")
+    if cfg.get("action") not in ("copy", "move", "delete"):
+        problemas.append(f"Ação inválida: {cfg.get('action')!r} (use copy, move ou delete)")
+    dest = str(cfg.get("destino") or "").strip()
+    if not dest:
+        problemas.append("Informe uma pasta de destino.")
+    elif not Path(dest).is_dir():
+        problemas.append(f"Pasta de destino inválida: {dest}")
+    elif not os.access(dest, os.W_OK):
+        problemas.append(f"Sem permissão de escrita em destino: {dest}")
+    if cfg.get("use_conditions", True):
+        if not cfg.get("colunas") and not str(cfg.get("condition_expression") or "").strip():
+            problemas.append("Condições ativas, mas sem nenhuma condição nem expressão lógica.")
+        if cfg.get("condition_mode", "excel") == "excel":
+            path = str(cfg.get("excel") or "").strip()
+            if not path or not Path(path).is_file():
+                problemas.append("Arquivo Excel de condições inválido ou não informado.")
+        elif not str(cfg.get("cond_folder") or "").strip() or not Path(cfg["cond_folder"].strip()).is_dir():
+            problemas.append("Pasta de condições inválida ou não informada.")
+    return problemas
+
+# Marca o fim da varredura na fila de trabalho
+_END_OF_SCAN = object()
+
+# ---- Processos de casamento (exec_mode="processes") ----
+_WORKER_ENGINE = None
+
+def _init_match_worker(kind, args, kwargs):
+    """Inicializador do ProcessPoolExecutor: recria o motor de condições uma vez por processo."""
+    global _WORKER_ENGINE
+    engine_cls = ExcelConditionEngine if kind == "excel" else FolderConditionEngine
+    _WORKER_ENGINE = engine_cls(*args, **kwargs)
+
+def _match_batch(stems):
+    """Casa um lote de nomes no processo; devolve (resultados, tempo de CPU gasto)."""
+    t0 = time.process_time()
+    eng = _WORKER_ENGINE
+    if isinstance(eng, ExcelConditionEngine):
+        eng.prefetch(stems)
+        out = [eng.match(s).rows for s in stems]
+    else:
+        out = [eng.matched_subfolders(s) for s in stems]
+    return out, time.process_time() - t0
+
 class Executor:
     
     def __init__(self, cfg, max_workers=4, progress_callback=None, error_callback=None, complete_callback=None,
-                 cancel_checker=None, report_callback=None):
+                 cancel_checker=None, report_callback=None, resume=False, metrics_callback=None):
+        """``resume=True`` continua a execução registrada no diário (ver ``resume_last``),
+        processando só o que ainda não foi concluído. ``progress_callback(done, total,
+        scanning, info)`` é chamado no máximo ``progress_hz`` vezes por segundo (ver
+        ``ProgressAggregator``) e sempre uma última vez no fim. ``metrics_callback(dict)``
+        recebe ``RunMetrics.snapshot()`` a cada ``metrics_interval`` segundos e no fim."""
         self.cfg = cfg
+        self.metrics_callback = metrics_callback or (lambda m: None)
+        self.metrics = RunMetrics(cfg.get("max_workers", max_workers))
         self.progress = progress_callback or (lambda *a: None)
         self.error = error_callback or (lambda *a: None)
         self.complete = complete_callback or (lambda: None)
@@ -321,27 +1907,64 @@ class Executor:
             recursivo=cfg.get("recursivo", True),
             hierarchy=cfg.get("hierarchy", False),
             criar_subpasta=cfg.get("criar_subpasta", False),
-            copy_dirs=cfg.get("copy_dirs", False)
+            copy_dirs=cfg.get("copy_dirs", False),
+            filters=cfg.get("file_filters", {})
         )
         self.use_cond = cfg.get("use_conditions", True)
         self.sep = cfg.get("cond_sep", "_")
         if self.use_cond:
             if cfg["condition_mode"] == "excel":
-                self.ce = ExcelConditionEngine(cfg["excel"], cfg["colunas"], cfg["principais"], cfg["condition_expression"])
+                self.ce = ExcelConditionEngine(cfg["excel"], cfg["colunas"], cfg["principais"], cfg["condition_expression"],
+                                               engine=cfg.get("match_engine", "auto"), table=cfg.get("cond_table"),
+                                               cache=cfg.get("cond_cache", True))
             else:
                 self.ce = FolderConditionEngine(cfg["cond_folder"], cfg["colunas"], cfg["principais"], self.sep, cfg["condition_expression"])
         else:
             self.ce = None
         self.max_workers = max_workers
+        # "threads": casamento dentro do pool de I/O; "processes": casamento em ProcessPoolExecutor
+        self.exec_mode = cfg.get("exec_mode", "threads")
         self.sobra = cfg.get("sobra", None)
         self.zip_dest = cfg.get("zip_dest", False)
         self.sobra_enabled = cfg.get("sobra_enabled", False)
+        self.subfolders = SubfolderIndex(self.fm.destino, persist=cfg.get("subpasta_index_cache", False))
+        self.fm.metrics = self.metrics
+        self.fm.on_error = self.error
+        # backend de cópia ("auto" = reflink > copy_file_range > sendfile > readinto)
+        self.copy_opts = {
+            "backend": cfg.get("copy_backend", "auto"),
+            "chunk_size": int(cfg.get("copy_chunk_mb", 1) * 1024 * 1024) or COPY_CHUNK,
+            "preserve_metadata": cfg.get("preserve_metadata", True),
+        }
         
+        # ==== execução incremental: política para arquivos já presentes no destino ====
+        self.policy = cfg.get("existing_policy", "overwrite")
+        if self.policy not in RunManifest.POLICIES:
+            raise ValueError(f"Política inválida para arquivos existentes: {self.policy!r}")
+        self.manifest = None
+        if cfg["action"] != "delete" and cfg.get("manifest", self.policy == "skip_unchanged"):
+            self.manifest = RunManifest.for_destination(self.fm.destino, cfg.get("manifest_hash", False))
+
+        # ==== diário para retomar a execução ====
+        self.journal = RunJournal(cfg.get("journal_path")) if cfg.get("journal", True) else None
+        self.resume = resume and self.journal is not None
+        self.done_ids = set()
+
         # ==== configuração de renomeação ====
         rename_cfg = cfg.get("rename", {})
         self.rename_enabled = rename_cfg.get("enabled", False)
         self.rename_pattern = rename_cfg.get("pattern", "")
 
+    @classmethod
+    def resume_last(cls, journal_path=None, **kwargs):
+        """Executor que retoma a última execução interrompida (config + diário), ou None."""
+        last = RunJournal.load_last(journal_path)
+        if last is None:
+            return None
+        cfg, _ = last
+        kwargs.setdefault("max_workers", cfg.get("max_workers", 4))
+        return cls(cfg, resume=True, **kwargs)
+
     def get_sobra_path(self):
         """
         Retorna o caminho absoluto para salvar sobras:
@@ -358,46 +1981,300 @@ class Executor:
         else:
             return str(p)
 
+    def _put(self, work, item):
+        while not self.cancel_checker():
+            try:
+                work.put(item, timeout=0.2)
+                return
+            except queue.Full:
+                continue
+
+    def _offload_matching(self):
+        """True se todo arquivo passa pelo casamento (vale a pena usar processos)."""
+        if self.ce is None or not self.cfg.get("condition_expression", "").strip() or not self.ce.boolean.names:
+            return False
+        if isinstance(self.ce, FolderConditionEngine):
+            return not (self.cfg["principais"] and (self.cfg.get("find_subpasta") or self.cfg.get("criar_subpasta")))
+        return True
+
+    def _produce(self, work, state, procs=None):
+        """Produtor: varre as origens e alimenta a fila limitada ``work``.
+
+        Com ``procs`` (ProcessPoolExecutor), os nomes são casados em lotes nos
+        processos e os resultados guardados no motor antes de seguirem para o
+        pool de I/O."""
+        batch = []
+        # só pré-calcula se ``_process`` vai consultar ``match`` (senão o resultado nunca sai de ``_prefetched``)
+        prefetch = (procs is None and isinstance(self.ce, ExcelConditionEngine) and self.ce.vector is not None
+                    and self._offload_matching())
+        if procs is not None:
+            batch_size = 128
+        elif prefetch:
+            batch_size = min(self.ce.vector.batch_size(), 256)
+        else:
+            batch_size = 1
+        outstanding = deque()
+        match = self.stats["match"]
+
+        def drain(limit):
+            while outstanding and (len(outstanding) > limit or outstanding[0][0].done()):
+                fut, entries = outstanding.popleft()
+                try:
+                    results, cpu = fut.result()
+                    self.ce.prime(zip((e.path.stem for e in entries), results))
+                    match["cpu_s"] += cpu
+                    match["batches"] += 1
+                    match["files"] += len(entries)
+                except Exception as e:
+                    self.error(f"Erro no processo de casamento: {e}")
+                match["wall_s"] = time.perf_counter() - match_start[0]
+                for f in entries:
+                    self._put(work, f)
+
+        match_start = [None]
+
+        def flush():
+            if not batch:
+                return
+            if procs is not None:
+                if match_start[0] is None:
+                    match_start[0] = time.perf_counter()
+                outstanding.append((procs.submit(_match_batch, [e.path.stem for e in batch]), list(batch)))
+                batch.clear()
+                drain(limit=2 * match["processes"])
+                return
+            if prefetch:
+                with self.metrics.phase("match"):
+                    self.ce.prefetch(e.path.stem for e in batch)
+            for f in batch:
+                self._put(work, f)
+            batch.clear()
+
+        try:
+            files = self.fm.iter_files()
+            while True:
+                t0 = time.perf_counter()
+                f = next(files, None)
+                self.metrics.add("scan", time.perf_counter() - t0)
+                if f is None or self.cancel_checker():
+                    break
+                if f.uid in self.done_ids:
+                    # concluído numa execução anterior (retomada)
+                    self.stats["resumed"] += 1
+                    self.fm.release(f)
+                    continue
+                state["discovered"] += 1
+                self.metrics.discovered += 1
+                batch.append(f)
+                if len(batch) >= batch_size:
+                    flush()
+            flush()
+            drain(limit=0)
+        except Exception as e:
+            self.error(f"Erro ao varrer origens: {e}")
+        finally:
+            state["scanning"] = False
+            self.metrics.scanning = False
+            while True:
+                try:
+                    work.put(_END_OF_SCAN, timeout=0.2)
+                    break
+                except queue.Full:
+                    if self.cancel_checker():
+                        break
+
+    def _skip_existing(self, entry, dst):
+        """Aplica ``existing_policy`` a um arquivo prestes a ser gravado em ``dst``."""
+        if self.policy == "skip_unchanged":
+            if self.manifest is None:
+                return False
+            opener = None
+            if entry.zip is not None:
+                # membro de ZIP: o caminho é virtual, o conteúdo vem do próprio arquivo .zip
+                archive, info = entry.zip
+                opener = lambda: archive.open().open(info)
+            return self.manifest.unchanged(entry.path, dst, entry.size, entry.mtime, opener)
+        if self.policy == "newer":
+            # o mais novo vence: só grava se a origem for mais recente que o destino
+            try:
+                return os.stat(dst).st_mtime >= entry.mtime
+            except OSError:
+                return False
+        return False
+
+    def _collect(self, fut, entry):
+        try:
+            res = fut.result()
+            results = [r for r in res if r] if isinstance(res, list) else [res] if res else []
+            for r in results:
+                self.report_callback(r)
+                self.stats["skipped" if r.get("metodo") == "skip" else "transferred"] += 1
+            if self.journal is not None:
+                self.journal.add(entry.uid, [r["destino"] for r in results])
+        except CopyCanceled:
+            pass
+        except Exception as e:
+            self.error(str(e))
+        finally:
+            self.fm.release(entry)
+
     def run(self):
-        files = self.fm.collect_files()
-        total = len(files)
+        """Pipeline produtor/consumidor: a varredura roda numa thread e alimenta uma
+        fila limitada; as cópias começam enquanto a varredura continua. O total
+        informado ao ``progress`` é o "descoberto até agora" enquanto ``scanning``;
+        as chamadas passam por um ``ProgressAggregator`` (``progress_hz``, padrão 15).
+
+        No máximo ``inflight_per_worker`` × threads tarefas ficam submetidas ao pool.
+        Ao cancelar, as tarefas pendentes são descartadas e as cópias em andamento
+        param no próximo bloco; ``stats["cancel_latency"]`` mede cancelamento → ocioso.
+        """
+        workers = self.cfg["max_workers"]
+        window = max(1, workers) * max(1, int(self.cfg.get("inflight_per_worker", 4)))
+        work = queue.Queue(maxsize=window)
+        state = {"discovered": 0, "scanning": True}
+        self.stats = {"cancel_latency": None, "transferred": 0, "skipped": 0, "resumed": 0}
+        self.metrics = self.fm.metrics = RunMetrics(workers)
+        interval = float(self.cfg.get("metrics_interval", 0.5))
+        last_emit = [0.0]
+        progress = ProgressAggregator(self.progress, self.metrics, float(self.cfg.get("progress_hz", 15)))
+
+        def emit(force=False):
+            now = time.perf_counter()
+            if force or now - last_emit[0] >= interval:
+                last_emit[0] = now
+                self.metrics.queue_depth = work.qsize()
+                self.metrics_callback(self.metrics.snapshot())
+        if self.journal is not None:
+            try:
+                if self.resume:
+                    self.done_ids = self.journal.resume()
+                else:
+                    self.journal.start(self.cfg)
+            except OSError as e:
+                self.error(f"Diário da execução indisponível (não será possível retomar): {e}")
+                self.journal = None
+        procs = None
+        if self.exec_mode == "processes" and self._offload_matching():
+            n_procs = int(self.cfg.get("match_processes") or os.cpu_count() or 1)
+            procs = ProcessPoolExecutor(max_workers=n_procs, initializer=_init_match_worker,
+                                        initargs=self.ce.worker_args())
+            self.stats["match"] = {"mode": "processes", "processes": n_procs, "batches": 0,
+                                   "files": 0, "cpu_s": 0.0, "wall_s": 0.0, "parallelism": None}
+        else:
+            self.stats["match"] = {"mode": "threads", "processes": 0, "batches": 0,
+                                   "files": 0, "cpu_s": 0.0, "wall_s": 0.0, "parallelism": None}
+        producer = threading.Thread(target=self._produce, args=(work, state, procs), daemon=True)
+        cancel_seen = None
+        completed = False
         done = 0
-        reports = []
+        units = {}  # future -> FileEntry
         try:
-            with ThreadPoolExecutor(max_workers=self.cfg["max_workers"]) as pool:
-                futures = {pool.submit(self._process, f): f for f in files}
-                for fut in as_completed(futures):
+            producer.start()
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                pending = set()
+                scan_finished = False
+                while True:
                     if self.cancel_checker():
+                        cancel_seen = time.perf_counter()
                         break
-                    f = futures[fut]
-                    try:
-                        res = fut.result()
-                        if isinstance(res, list):
-                            for r in res:
-                                self.report_callback(r)
-                                reports.append(r)
-                        elif res:
-                            self.report_callback(res)
-                            reports.append(res)
-                    except Exception as e:
-                        self.error(str(e))
-                    finally:
+                    # completa a janela de tarefas em andamento
+                    while not scan_finished and len(pending) < window:
+                        try:
+                            f = work.get(timeout=0.05 if pending else 0.2)
+                        except queue.Empty:
+                            break
+                        if f is _END_OF_SCAN:
+                            scan_finished = True
+                            break
+                        fut = pool.submit(self._process_timed, f)
+                        units[fut] = f
+                        pending.add(fut)
+                    if not pending:
+                        if scan_finished:
+                            break
+                        progress.update(done, state["discovered"], state["scanning"])
+                        emit()
+                        continue
+                    finished, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                    for fut in finished:
+                        entry = units.pop(fut)
+                        self._collect(fut, entry)
                         done += 1
-                        self.progress(done, total)
+                        self.metrics.done = done
+                        progress.update(done, state["discovered"], state["scanning"], entry.path.name)
+                    emit()
+                if cancel_seen is not None:
+                    # descarta o que ainda não começou; o que está rodando para no próximo bloco
+                    for fut in pending:
+                        fut.cancel()
+                    finished, _ = wait(pending)
+                    for fut in finished:
+                        if not fut.cancelled():
+                            self._collect(fut, units.pop(fut))
+                else:
+                    completed = True
         finally:
+            producer.join(timeout=1)
+            if procs is not None:
+                procs.shutdown(wait=True, cancel_futures=True)
+                match = self.stats["match"]
+                if match["wall_s"] > 0:
+                    # paralelismo efetivo: CPU somada dos processos / tempo de parede do casamento
+                    match["parallelism"] = match["cpu_s"] / match["wall_s"]
             self.fm.cleanup()
-            if self.zip_dest:
-                self._zip_destination()
+            self.subfolders.save()
+            if self.manifest is not None:
+                self.manifest.close()
+            if self.journal is not None:
+                # só marca como concluída se não houve cancelamento nem erro fatal
+                self.journal.close(finished=completed)
+            if cancel_seen is not None:
+                self.stats["cancel_latency"] = time.perf_counter() - cancel_seen
+            elif self.zip_dest:
+                with self.metrics.phase("zip"):
+                    self._zip_destination()
+            self.metrics.done = done
+            # o estado final chega sempre, mesmo que a última atualização tenha sido segurada
+            progress.update(done, state["discovered"], state["scanning"])
+            progress.flush()
+            emit(force=True)
+            self._dump_profile()
             self.complete()
 
-    def _process(self, f):
-        # 1) filtrar por extensão/data
-        if not match_filters(f, self.cfg.get("file_filters", {})):
-            return None
+    def _process_timed(self, entry):
+        """``_process`` contando a ocupação das threads do pool."""
+        self.metrics.task_started()
+        t0 = time.perf_counter()
+        try:
+            return self._process(entry)
+        finally:
+            self.metrics.task_finished(time.perf_counter() - t0)
+
+    def _dump_profile(self):
+        """Grava o perfil da execução (métricas finais + stats) em JSON."""
+        snap = self.metrics.snapshot()
+        profile = {"inicio": datetime.fromtimestamp(time.time() - snap["elapsed_s"]).isoformat(),
+                   "metricas": snap,
+                   "stats": {k: v for k, v in self.stats.items() if k != "profile"}}
+        self.stats["profile"] = profile
+        path = Path(self.cfg.get("profile_path") or CACHE_DIR / "perfil_ultima_execucao.json")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open("w", encoding="utf-8") as fh:
+                json.dump(profile, fh, indent=2, ensure_ascii=False, default=str)
+        except OSError as e:
+            self.error(f"Não foi possível gravar o perfil da execução: {e}")
+
+    def _process(self, entry):
+        # 1) filtros de extensão/data já aplicados na varredura (FileManager)
+        f = entry.path
+        if self.cfg["action"] == "delete" and entry.zip is not None:
+            return None  # membros de ZIP não são apagados de dentro do arquivo
 
         # 2) hierarquia física (quando hierarchy=True e criar_subpasta=False)
         rel_hierarchy = None
-        if not self.cfg.get("criar_subpasta", False) and self.fm.hierarchy:
+        # membros de ZIP vão para a raiz do destino (não herdam a pasta do arquivo .zip)
+        if not self.cfg.get("criar_subpasta", False) and self.fm.hierarchy and entry.zip is None:
             for origem in self.origins:
                 try:
                     rel = f.relative_to(origem).parent
@@ -406,19 +2283,31 @@ class Executor:
                 except Exception:
                     continue
 
-        # helper: aplica delete ou copy com renomeação, hierarquia e subpasta
-        def _do_transfer(src, sub=None, hierarchy_path=None):
+        # mover: o primeiro destino recebe o arquivo (rename), os demais copiam dele
+        move = self.cfg["action"] == "move"
+        moved_to = [None]
+
+        # helper: aplica delete, copy ou move com renomeação, hierarquia e subpasta
+        def _do_transfer(src, sub=None, hierarchy_path=None, rows=()):
+            # linhas do Excel que levaram a esta transferência (auditoria no relatório)
+            linhas = MatchResult.excel_lines(rows)
             # delete
             if self.cfg["action"] == "delete":
-                if src.is_dir():
+                t0 = time.perf_counter()
+                if entry.is_dir:
                     shutil.rmtree(src)
                 else:
                     src.unlink()
+                elapsed = time.perf_counter() - t0
+                self.metrics.add("transfer", elapsed)
                 return {
                     "arquivo": src.name,
                     "origem": str(src),
                     "destino": "DELETADO",
-                    "acao": "delete"
+                    "acao": "delete",
+                    "linhas": linhas,
+                    "metodo": "rmtree" if entry.is_dir else "unlink",
+                    "tempo_ms": round(elapsed * 1000, 3)
                 }
             # monta pasta destino
             dst_dir = self.fm.destino
@@ -427,6 +2316,7 @@ class Executor:
             if sub:
                 dst_dir = dst_dir / sub
             dst_dir.mkdir(parents=True, exist_ok=True)
+            self.subfolders.add(dst_dir)
 
             # renomeação
             final_name = src.name
@@ -435,21 +2325,13 @@ class Executor:
                 # remove aspas do padrão ("texto" -> texto)
                 pattern = re.sub(r'"([^"]+)"', r'\1', pattern)
 
-                # tenta obter a linha do Excel que casa com este arquivo
-                row = None
+                # valores da primeira linha do Excel que casa com este arquivo (resultado memoizado)
                 values = {}
-
-                try:
-                    from pandas import Series  # só para type hint leve
-                except Exception:
-                    pass
-
                 if isinstance(self.ce, ExcelConditionEngine):
-                    row = self.ce.find_matching_row(src.stem)  # << nova função (abaixo)
-                    if row is not None:
-                        for nome, col in self.ce.cols.items():
-                            if col in row:
-                                values[nome] = str(row[col]).strip()
+                    with self.metrics.phase("match"):
+                        m = self.ce.match(src.stem)
+                    if m:
+                        values = m.values(m.rows[0])
 
                 # sanear caracteres inválidos em nomes de arquivo no Windows
                 def _sanitize(v: str) -> str:
@@ -464,31 +2346,47 @@ class Executor:
                 pattern = re.sub(r'!([^!]+)!', _repl, pattern)
                 final_name = pattern + src.suffix
 
-            # copy file ou pasta
-            report = None
-            if src.is_file():
-                shutil.copy2(src, dst_dir / final_name)
-                report = {
-                    "arquivo": src.name,
-                    "origem": str(src),
-                    "destino": str(dst_dir / final_name),
-                    "acao": self.cfg["action"]
-                }
+            # copy/move do arquivo ou cópia da pasta
+            t0 = time.perf_counter()
+            if not entry.is_dir:
+                dst = dst_dir / final_name
+                if self._skip_existing(entry, dst):
+                    metodo = "skip"
+                elif entry.zip is not None:
+                    # fonte virtual: descompacta o membro direto no destino (o .zip fica intacto)
+                    metodo = extract_zip_member(entry.zip[0].open(), entry.zip[1], dst, self.cancel_checker,
+                                                self.copy_opts["chunk_size"], self.copy_opts["preserve_metadata"])
+                elif move and moved_to[0] is None:
+                    metodo = move_file(src, dst, self.cancel_checker, **self.copy_opts)
+                    moved_to[0] = dst
+                elif moved_to[0] == dst:
+                    # outra linha levou ao mesmo destino: o arquivo já está lá
+                    metodo = "dup"
+                else:
+                    # "multiplicar" com mover: destinos seguintes copiam a partir do já movido
+                    metodo = copy_file(moved_to[0] or src, dst, self.cancel_checker, **self.copy_opts)
+                if self.manifest is not None and metodo not in ("skip", "dup"):
+                    self.manifest.record(entry.path, dst, entry.size, entry.mtime)
+            elif move and moved_to[0] is None:
+                dst = dst_dir / src.name
+                metodo = move_tree(src, dst, self.cancel_checker, **self.copy_opts)
+                moved_to[0] = dst
             else:
-                dest_folder = dst_dir / src.name
-                dest_folder.mkdir(parents=True, exist_ok=True)
-                for item in src.rglob("*"):
-                    if item.is_file():
-                        rel = item.relative_to(src)
-                        (dest_folder / rel.parent).mkdir(parents=True, exist_ok=True)
-                        shutil.copy2(item, dest_folder / rel)
-                report = {
-                    "arquivo": src.name,
-                    "origem": str(src),
-                    "destino": str(dest_folder),
-                    "acao": self.cfg["action"]
-                }
-            return report
+                dst = dst_dir / src.name
+                metodo = copy_tree(moved_to[0] or src, dst, self.cancel_checker, **self.copy_opts)
+            elapsed = time.perf_counter() - t0
+            # bytes efetivamente gravados (rename/skip não movem dados)
+            written = entry.size if not entry.is_dir and metodo not in ("skip", "dup", "rename") else 0
+            self.metrics.add("transfer", elapsed, written)
+            return {
+                "arquivo": src.name,
+                "origem": str(src),
+                "destino": str(dst),
+                "acao": self.cfg["action"],
+                "linhas": linhas,
+                "metodo": metodo,
+                "tempo_ms": round(elapsed * 1000, 3)
+            }
 
         # 2.1) se use_cond=True mas expressão vazia, aceitar todos os arquivos
         expr = self.cfg.get("condition_expression", "").strip()
@@ -498,7 +2396,9 @@ class Executor:
         # 2.2) expressão isolada sem nenhuma coluna cadastrada
         if self.use_cond and expr and not self.ce.boolean.names:
             # avalia literais em "" + operadores lógicos
-            if self.ce.boolean.evaluate({}, f.stem):
+            with self.metrics.phase("match"):
+                ok = self.ce.boolean.evaluate({}, f.stem)
+            if ok:
                 return _do_transfer(f, hierarchy_path=rel_hierarchy)
             else:
                 return None
@@ -511,7 +2411,8 @@ class Executor:
         if isinstance(self.ce, FolderConditionEngine):
             subpasta = None
             if self.cfg["principais"]:
-                subpasta = self.ce.build_principais_subfolder(f.stem)
+                with self.metrics.phase("match"):
+                    subpasta = self.ce.build_principais_subfolder(f.stem)
             find_sub = self.cfg.get("find_subpasta", False)
             criar_sub = self.cfg.get("criar_subpasta", False)
             multipl = self.cfg.get("multiply", False)
@@ -519,7 +2420,8 @@ class Executor:
 
             # procurar subpasta existente
             if find_sub and subpasta:
-                encontrados = buscar_subpasta(self.cfg["destino"], subpasta, self.cfg.get("recursivo", True))
+                with self.metrics.phase("subpasta"):
+                    encontrados = self.subfolders.find(subpasta, self.cfg.get("recursivo", True))
                 if encontrados:
                     if multipl:
                         return [ _do_transfer(f, None, p.relative_to(self.fm.destino)) for p in encontrados ]
@@ -541,7 +2443,8 @@ class Executor:
                 return _do_transfer(f, subpasta)
 
             # match em subpastas pela expressão
-            matches = self.ce.matched_subfolders(f.stem)
+            with self.metrics.phase("match"):
+                matches = self.ce.matched_subfolders(f.stem)
             if multipl:
                 reports = [ _do_transfer(f, sub, rel_hierarchy) for sub in matches ]
                 if not reports and tem_sobra:
@@ -559,48 +2462,39 @@ class Executor:
             criar_sub = self.cfg.get("criar_subpasta", False)
             multipl = self.cfg.get("multiply", False)
             tem_sobra = self.sobra_enabled and bool(self.sobra)
-            matched = []
-
-            # buscar linhas que batem
-            if self.ce.df is not None:
-                fname = f.stem.lower()
-                for _, row in self.ce.df.iterrows():
-                    md = {}
-                    for n, col in self.ce.cols.items():
-                        val = str(row[col]).strip() if col in row else ""
-                        md[n] = self.ce._token_in_filename(val, fname) if val else False
-                    if self.ce.boolean.evaluate(md, fname):
-                        matched.append(row)
+
+            # buscar linhas que batem (resultado único, memoizado por nome)
+            with self.metrics.phase("match"):
+                m = self.ce.match(f.stem)
 
             # múltiplos
-            if multipl and matched:
+            if multipl and m:
                 reports = []
-                for row in matched:
-                    vals = [str(row[self.ce.cols[n]]).strip() for n in self.cfg["principais"]]
-                    subp = self.sep.join(vals)
+                for i in m.rows:
+                    subp = m.subfolder(i, self.cfg["principais"], self.sep)
                     if find_sub and subp:
-                        enc = buscar_subpasta(self.cfg["destino"], subp, self.cfg.get("recursivo", True))
+                        with self.metrics.phase("subpasta"):
+                            enc = self.subfolders.find(subp, self.cfg.get("recursivo", True))
                         for pasta in enc:
-                            reports.append(_do_transfer(f, None, pasta.relative_to(self.fm.destino)))
+                            reports.append(_do_transfer(f, None, pasta.relative_to(self.fm.destino), rows=[i]))
                         continue
                     if criar_sub and subp:
-                        reports.append(_do_transfer(f, subp))
+                        reports.append(_do_transfer(f, subp, rows=[i]))
                         continue
-                    reports.append(_do_transfer(f, None, rel_hierarchy))
+                    reports.append(_do_transfer(f, None, rel_hierarchy, rows=[i]))
                 return reports or None
 
             # único match
-            if matched:
-                row = matched[0]
-                vals = [str(row[self.ce.cols[n]]).strip() for n in self.cfg["principais"]]
-                subp = self.sep.join(vals)
+            if m:
+                subp = m.subfolder(m.rows[0], self.cfg["principais"], self.sep)
                 if find_sub and subp:
-                    enc = buscar_subpasta(self.cfg["destino"], subp, self.cfg.get("recursivo", True))
+                    with self.metrics.phase("subpasta"):
+                        enc = self.subfolders.find(subp, self.cfg.get("recursivo", True))
                     if enc:
-                        return _do_transfer(f, None, enc[0].relative_to(self.fm.destino))
+                        return _do_transfer(f, None, enc[0].relative_to(self.fm.destino), rows=m.rows)
                 if criar_sub and subp:
-                    return _do_transfer(f, subp)
-                return _do_transfer(f, None, rel_hierarchy)
+                    return _do_transfer(f, subp, rows=m.rows)
+                return _do_transfer(f, None, rel_hierarchy, rows=m.rows)
 
             # sobra
             if tem_sobra:
@@ -610,9 +2504,17 @@ class Executor:
     def _zip_destination(self):
         dest_dir = Path(self.cfg["destino"])
         zip_path = dest_dir.parent / (dest_dir.name + ".zip")
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for root, dirs, files in os.walk(dest_dir):
-                for file in files:
-                    absfile = Path(root) / file
-                    relpath = absfile.relative_to(dest_dir.parent)
-                    zipf.write(absfile, relpath)
+        store_ext = self.cfg.get("zip_store_ext")
+        store_ext = (frozenset(e.lower() if e.startswith(".") else "." + e.lower() for e in store_ext)
+                     if store_ext is not None else ZIP_STORE_EXTENSIONS)
+        try:
+            self.stats["zip"] = zip_directory(
+                dest_dir, zip_path,
+                level=int(self.cfg.get("zip_level", 6)),
+                store_ext=store_ext,
+                split_bytes=int(float(self.cfg.get("zip_split_mb", 0) or 0) * 1024 * 1024),
+                workers=self.cfg.get("max_workers", 4),
+                cancel_checker=self.cancel_checker,
+            )
+        except CopyCanceled:
+            self.stats["zip"] = None
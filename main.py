@@ -1,5 +1,7 @@
 #main.py
-import sys, os, json, re
+import sys, os, json, re, time
+_T0 = time.perf_counter()  # início do processo, para medir o tempo até a janela ficar interativa
+import importlib
 from functools import partial
 from pathlib import Path
 from PySide6.QtWidgets import (
@@ -8,14 +10,21 @@ from PySide6.QtWidgets import (
     QRadioButton, QButtonGroup, QSlider, QTableWidget,
     QTableWidgetItem, QFileDialog, QScrollArea, QAbstractItemView,
     QHeaderView, QProgressBar, QMessageBox, QComboBox, QInputDialog,
-    QDialog, QColorDialog, QFormLayout, QListWidget, QSizePolicy, QStackedWidget, QFrame
+    QDialog, QColorDialog, QFormLayout, QListWidget, QSizePolicy, QStackedWidget, QFrame, QSpinBox,
+    QTableView
+)
+from PySide6.QtCore import (
+    Qt, QThread, Signal, QTimer, QPropertyAnimation, QEasingCurve, QSize, QTimeLine,
+    QAbstractTableModel, QModelIndex
 )
-from PySide6.QtCore import Qt, QThread, Signal, QTimer, QPropertyAnimation, QSequentialAnimationGroup, QEasingCurve, QSize, QTimeLine
 from PySide6.QtGui import QColor, QIcon, QMovie, QPixmap
-import pandas as pd
+from report import REPORT_COLUMNS, ReportStore, export_report, import_report
 
 # ================== Splash Integrada ===================
 def show_splash_and_run(main_window_class):
+    """Mostra a splash, constrói a janela enquanto ela está na tela e fecha a
+    splash assim que a janela fica pronta. Com ``--medir-inicio`` imprime os tempos
+    e sai assim que a janela fica interativa (para medir a inicialização a frio)."""
     app = QApplication(sys.argv)
     app.setApplicationName("GAELIS")
     icon_path = 'splash.png'
@@ -53,31 +62,50 @@ def show_splash_and_run(main_window_class):
     geom.moveCenter(center_point)
     splash_widget.move(geom.topLeft())
     splash_widget.show()
+    app.processEvents()  # garante a splash pintada antes de construir a janela
+    timings = {"splash": time.perf_counter() - _T0}
 
-    fade_in = QPropertyAnimation(splash_widget, b"windowOpacity")
-    fade_in.setDuration(800)
-    fade_in.setStartValue(0.0)
-    fade_in.setEndValue(1.0)
-    fade_in.setEasingCurve(QEasingCurve.InOutQuad)
     fade_out = QPropertyAnimation(splash_widget, b"windowOpacity")
-    fade_out.setDuration(900)
+    fade_out.setDuration(300)
     fade_out.setStartValue(1.0)
     fade_out.setEndValue(0.0)
     fade_out.setEasingCurve(QEasingCurve.InOutQuad)
-    seq = QSequentialAnimationGroup()
-    seq.addAnimation(fade_in)
-    seq.addPause(1200)
-    seq.addAnimation(fade_out)
+    fade_out.finished.connect(splash_widget.close)
+
+    def interactive():
+        timings["interativa"] = time.perf_counter() - _T0
+        window.startup_times = {k: round(v * 1000) for k, v in timings.items()}
+        if "--medir-inicio" in sys.argv:
+            print("[startup] " + " · ".join(f"{k} {v} ms" for k, v in window.startup_times.items()))
+            app.quit()
 
     def start_app():
-        splash_widget.close()
+        nonlocal window
         window = main_window_class()
+        timings["janela"] = time.perf_counter() - _T0
         window.show()
+        fade_out.start()
+        QTimer.singleShot(0, interactive)  # primeira volta do loop com a janela na tela
 
-    seq.finished.connect(start_app)
-    QTimer.singleShot(0, seq.start)
+    window = None
+    QTimer.singleShot(0, start_app)
     # Só um app.exec()
-    sys.exit(app.exec())
+    code = app.exec()
+    if window is not None:
+        window._preloader.wait()  # não destruir a thread no meio de uma importação
+    sys.exit(code)
+
+class ModulePreloader(QThread):
+    """Importa em segundo plano os módulos pesados (pandas, openpyxl, executor),
+    para que a janela abra sem esperar por eles e o primeiro uso não pague a importação."""
+    MODULES = ("pandas", "openpyxl", "executor")
+
+    def run(self):
+        for name in self.MODULES:
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                pass  # openpyxl é opcional até exportar/importar relatórios
 
 # ================== Utilidade Flag + Info ===================
 FLAG_INFOS = {
@@ -110,7 +138,13 @@ FLAG_INFOS = {
         "Extrai arquivos de dentro de arquivos ZIP, caso existam, antes de processar."
     ),
     "chk_zip": (
-        "Compacta toda a pasta de destino em um arquivo ZIP ao final do processamento."
+        "Compacta toda a pasta de destino em um arquivo ZIP ao final do processamento. "
+        "Os arquivos são comprimidos em paralelo; formatos já comprimidos (PDF, JPG, ZIP...) são guardados como estão. "
+        "Com 'Dividir', gera volumes independentes (destino.zip, destino.parte2.zip...)."
+    ),
+    "chk_metadata": (
+        "Copia também datas e permissões do arquivo original (como o copy2). "
+        "Desmarcar acelera cópias em compartilhamentos de rede, onde cada ajuste de metadados custa uma ida ao servidor."
     ),
     "chk_findsub": (
         "Procura uma subpasta existente com o nome correspondente às condições principais, e move o arquivo para ela. Se não encontrar, pode criar ou copiar para pasta sobra (veja as outras opções)."
@@ -176,16 +210,24 @@ def salvar_settings(s):
 # --- THREAD DE EXECUÇÃO COM CANCELAMENTO E RELATÓRIO ---
 
 class ExecutorThread(QThread):
-    progress = Signal(int, int)    # Processados, total
+    REPORT_INTERVAL = 0.25
+    progress = Signal(int, int, bool, dict)  # Processados, total (descoberto até agora), varrendo, info (ProgressAggregator)
     error    = Signal(str)
-    finished = Signal(list)        # Lista de dicionários de relatório
-    canceled = Signal()
+    finished = Signal(object)      # ReportStore com o relatório completo
+    rows_added = Signal(int)       # Linhas no relatório até agora (no máximo a cada REPORT_INTERVAL s)
+    canceled = Signal(float)       # Segundos entre o pedido de cancelamento e a parada
+    failed   = Signal(str)         # Falha ao preparar a execução (config inválida)
+    metrics  = Signal(dict)        # RunMetrics.snapshot(): vazão, ETA, tempo por fase
 
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, resume=False):
         super().__init__()
         self.config = config
+        self.resume = resume
         self.cancel_requested = False
-        self._report = []
+        self._cancel_time = None
+        self.report = ReportStore()
+        self._last_rows_emit = 0.0
+        self.stats = {}
 
     def run(self):
         try:
@@ -193,52 +235,184 @@ class ExecutorThread(QThread):
         except Exception as e:
             self.error.emit(f"Erro ao importar executor: {e}")
             return
-        executor = Executor(
-            self.config,
-            max_workers=self.config.get("max_workers", 4),
-            progress_callback=self._progress_callback,
-            error_callback=lambda e: self.error.emit(str(e)),
-            cancel_checker=lambda: self.cancel_requested,
-            report_callback=self._append_report
-        )
+        try:
+            executor = Executor(
+                self.config,
+                max_workers=self.config.get("max_workers", 4),
+                progress_callback=self._progress_callback,
+                error_callback=lambda e: self.error.emit(str(e)),
+                cancel_checker=lambda: self.cancel_requested,
+                report_callback=self._append_report,
+                resume=self.resume,
+                metrics_callback=self.metrics.emit
+            )
+        except Exception as e:
+            self.failed.emit(f"Erro ao preparar execução: {e}")
+            return
         executor.run()
+        self.stats = executor.stats
+        self.rows_added.emit(len(self.report))
         if self.cancel_requested:
-            self.canceled.emit()
+            self.canceled.emit(time.perf_counter() - self._cancel_time)
         else:
-            self.finished.emit(self._report)
+            self.finished.emit(self.report)
 
     def cancel(self):
+        if not self.cancel_requested:
+            self._cancel_time = time.perf_counter()
         self.cancel_requested = True
 
-    def _progress_callback(self, p, t):
-        self.progress.emit(p, t)
+    def _progress_callback(self, p, t, scanning=False, info=None):
+        self.progress.emit(p, t, scanning, info or {})
 
     def _append_report(self, item):
-        self._report.append(item)
+        self.report.append(item)
+        now = time.monotonic()
+        if now - self._last_rows_emit >= self.REPORT_INTERVAL:
+            self._last_rows_emit = now
+            self.rows_added.emit(len(self.report))
 
 # ========== Report Dialog com Exportação ==========
 
+def _sort_key(value):
+    if isinstance(value, (int, float)):
+        return (0, value, "")
+    return (1, 0, str(value).lower())
+
+class ReportModel(QAbstractTableModel):
+    """Modelo sobre um ``ReportStore``: só as células visíveis são formatadas.
+
+    Ordenação e filtro mantêm uma lista de índices do store (``None`` = ordem
+    original, sem filtro). Linhas que chegam durante a execução (``sync``)
+    entram no fim da visão; clicar de novo no cabeçalho reordena tudo.
+    """
+
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self._count = len(store)
+        self._rows = None
+        self._filter = ""
+        self._filter_col = None
+        self._sort = None  # (chave, reverso)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._count if self._rows is None else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.store.keys)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role not in (Qt.DisplayRole, Qt.ToolTipRole) or not index.isValid():
+            return None
+        row = index.row() if self._rows is None else self._rows[index.row()]
+        value = self.store.value(row, self.store.keys[index.column()])
+        return "" if value is None else str(value)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.store.titles[section]
+        return str(section + 1)
+
+    def _filtered(self, start, stop):
+        """Índices em [start, stop) que contêm o texto do filtro, varrendo coluna a coluna."""
+        needle = self._filter
+        keys = self.store.keys if self._filter_col is None else [self._filter_col]
+        hits = set()
+        for key in keys:
+            # só o trecho pedido: em ``sync`` são as poucas linhas novas, não o relatório inteiro
+            col = self.store.column(key, start, stop)
+            hits.update(start + j for j, v in enumerate(col) if needle in str(v).lower())
+        return sorted(hits)
+
+    def _rebuild(self):
+        idx = range(self._count)
+        if self._filter:
+            idx = self._filtered(0, self._count)
+        if self._sort is not None:
+            key, reverse = self._sort
+            values = self.store.column(key)
+            idx = sorted(idx, key=lambda i: _sort_key(values[i]), reverse=reverse)
+        self._rows = None if not self._filter and self._sort is None else list(idx)
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.beginResetModel()
+        self._sort = None if column < 0 else (self.store.keys[column], order == Qt.DescendingOrder)
+        self._rebuild()
+        self.endResetModel()
+
+    def set_filter(self, text, column=None):
+        """Filtra por trecho de texto (sem diferenciar maiúsculas) numa coluna ou em todas."""
+        self.beginResetModel()
+        self._filter = text.strip().lower()
+        self._filter_col = column
+        self._rebuild()
+        self.endResetModel()
+
+    def sync(self, _=None):
+        """Incorpora as linhas acrescentadas ao store desde a última chamada."""
+        total = len(self.store)
+        if total <= self._count:
+            return
+        new = range(self._count, total)
+        if self._rows is None:
+            self.beginInsertRows(QModelIndex(), self._count, total - 1)
+            self._count = total
+            self.endInsertRows()
+            return
+        self._count = total
+        added = self._filtered(new.start, new.stop) if self._filter else list(new)
+        if added:
+            first = len(self._rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(added) - 1)
+            self._rows.extend(added)
+            self.endInsertRows()
+
 class ReportDialog(QDialog):
     
     def __init__(self, report, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Relatório de Execução")
-        self.report = report
+        self.resize(900, 520)
+        self.report = report if isinstance(report, ReportStore) else ReportStore.from_records(report)
         layout = QVBoxLayout(self)
-        self.table = QTableWidget(len(report), 4)
-        self.table.setHorizontalHeaderLabels(["Arquivo", "Origem", "Destino", "Ação"])
-        for i, r in enumerate(report):
-            self.table.setItem(i, 0, QTableWidgetItem(r.get("arquivo", "")))
-            self.table.setItem(i, 1, QTableWidgetItem(r.get("origem", "")))
-            self.table.setItem(i, 2, QTableWidgetItem(r.get("destino", "")))
-            self.table.setItem(i, 3, QTableWidgetItem(r.get("acao", "")))
-        self.table.resizeColumnsToContents()
+        self.lbl_summary = QLabel()
+        layout.addWidget(self.lbl_summary)
+        h_filter = QHBoxLayout()
+        h_filter.addWidget(QLabel("Filtrar:"))
+        self.le_filter = QLineEdit()
+        self.le_filter.setPlaceholderText("trecho do nome, pasta, método...")
+        self.combo_filter = QComboBox()
+        self.combo_filter.addItem("Todas as colunas", None)
+        for key, title in REPORT_COLUMNS:
+            self.combo_filter.addItem(title, key)
+        h_filter.addWidget(self.le_filter)
+        h_filter.addWidget(self.combo_filter)
+        layout.addLayout(h_filter)
+        # filtro aplicado com um pequeno atraso, para não varrer o relatório a cada tecla
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(250)
+        self._filter_timer.timeout.connect(self._apply_filter)
+        self.le_filter.textChanged.connect(self._filter_timer.start)
+        self.combo_filter.currentIndexChanged.connect(self._apply_filter)
+
+        self.table = QTableView()
         self.table.setSelectionMode(QAbstractItemView.NoSelection)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.horizontalHeader().setResizeContentsPrecision(200)  # mede só as primeiras linhas
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self._set_store(self.report)
+        self.table.setSortingEnabled(True)
         layout.addWidget(self.table)
         h = QHBoxLayout()
-        btn_save = QPushButton("Salvar Excel")
+        btn_save = QPushButton("Salvar Relatório")
         btn_save.clicked.connect(self.save_excel)
-        btn_import = QPushButton("Importar Excel")
+        btn_import = QPushButton("Importar Relatório")
         btn_import.clicked.connect(self.import_excel)
         btn_close = QPushButton("Fechar")
         btn_close.clicked.connect(self.accept)
@@ -248,22 +422,81 @@ class ReportDialog(QDialog):
         h.addWidget(btn_close)
         layout.addLayout(h)
 
+    def _set_store(self, store):
+        self.report = store
+        self.model = ReportModel(store, self)
+        self.table.setModel(self.model)
+        self.table.resizeColumnsToContents()
+        self._update_summary()
+
+    def _apply_filter(self):
+        self.model.set_filter(self.le_filter.text(), self.combo_filter.currentData())
+        self._update_summary()
+
+    def _update_summary(self):
+        total = len(self.report)
+        skipped = self.report.count("metodo", "skip")
+        txt = f"Transferidos: {total - skipped}    Pulados (inalterados): {skipped}"
+        shown = self.model.rowCount()
+        if shown != total:
+            txt += f"    Exibindo: {shown} de {total}"
+        self.lbl_summary.setText(txt)
+
+    def sync(self, _=None):
+        """Atualiza a tabela com as linhas novas (execução em andamento)."""
+        resize = self.model.rowCount() == 0
+        self.model.sync()
+        if resize and self.model.rowCount():
+            self.table.resizeColumnsToContents()
+        self._update_summary()
+
     def save_excel(self):
-        path, _ = QFileDialog.getSaveFileName(self, "Salvar relatório como", "relatorio.xlsx", "Excel (*.xlsx)")
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Salvar relatório como", "relatorio.xlsx",
+            "Excel (*.xlsx);;CSV (*.csv);;JSON Lines (*.jsonl);;Parquet (*.parquet)")
         if path:
-            df = pd.DataFrame(self.report)
-            df.to_excel(path, index=False)
+            QApplication.setOverrideCursor(Qt.WaitCursor)
+            try:
+                export_report(self.report, path)  # em fluxo; acima de ~1M linhas o xlsx ganha novas abas
+            except (OSError, ValueError) as e:
+                QMessageBox.warning(self, "Erro", f"Falha ao salvar relatório: {e}")
+            finally:
+                QApplication.restoreOverrideCursor()
 
     def import_excel(self):
-        path, _ = QFileDialog.getOpenFileName(self, "Abrir relatório Excel", "", "Excel (*.xlsx *.xls)")
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Abrir relatório", "",
+            "Relatórios (*.xlsx *.xls *.csv *.jsonl *.parquet);;Todos (*)")
         if path:
-            df = pd.read_excel(path)
-            self.table.setRowCount(len(df))
-            for i, (_, row) in enumerate(df.iterrows()):
-                self.table.setItem(i, 0, QTableWidgetItem(str(row.get("arquivo", ""))))
-                self.table.setItem(i, 1, QTableWidgetItem(str(row.get("origem", ""))))
-                self.table.setItem(i, 2, QTableWidgetItem(str(row.get("destino", ""))))
-                self.table.setItem(i, 3, QTableWidgetItem(str(row.get("acao", ""))))
+            try:
+                chunks = import_report(path)
+            except ValueError as e:
+                QMessageBox.warning(self, "Erro", str(e))
+                return
+            self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+            self._set_store(ReportStore())
+            self._apply_filter()
+            self._import_chunks = chunks
+            QTimer.singleShot(0, self._import_next)
+
+    def _import_next(self):
+        """Lê um bloco do arquivo importado por volta do loop de eventos: a tabela
+        já mostra as primeiras linhas enquanto o resto é carregado."""
+        chunks = getattr(self, "_import_chunks", None)
+        if chunks is None:
+            return
+        try:
+            block = next(chunks, None)
+        except Exception as e:
+            self._import_chunks = None
+            QMessageBox.warning(self, "Erro", f"Falha ao importar relatório: {e}")
+            return
+        if block is None:
+            self._import_chunks = None
+            return
+        self.report.extend(block)
+        self.sync()
+        QTimer.singleShot(0, self._import_next)
 
 class ThemeEditorDialog(QDialog):
     
@@ -577,6 +810,17 @@ class MainWindow(QMainWindow):
                 )
                 return False
 
+        # 4.1) expressão lógica precisa ser válida (erros de sintaxe aparecem aqui, não na execução)
+        if cfg["use_conditions"] and cfg["condition_expression"].strip():
+            try:
+                from executor import BooleanConditionEngine, ExpressionError
+                BooleanConditionEngine(list(cfg["colunas"].keys()), cfg["condition_expression"])
+            except ExpressionError as e:
+                QMessageBox.warning(self, "Validação", f"Expressão lógica inválida:\n{e}")
+                return False
+            except ImportError:
+                pass
+
         # 5) valida formato das datas, se marcadas
         def ok_date(txt):
             return bool(re.match(r"^\d{2}-\d{2}-\d{4}$", txt) or
@@ -588,6 +832,28 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Validação", "Data final inválida. Use dd-mm-aaaa ou aaaa-mm-dd.")
             return False
 
+        # 5.1) demais filtros: números e expressão regular
+        def ok_number(txt):
+            try:
+                return float(txt.replace(",", ".")) >= 0
+            except ValueError:
+                return False
+        if self.chk_size.isChecked():
+            for field in (self.in_size_min, self.in_size_max):
+                txt = field.text().strip()
+                if txt and not ok_number(txt):
+                    QMessageBox.warning(self, "Validação", "Tamanho inválido. Informe um número de KB.")
+                    return False
+        if self.chk_age.isChecked() and self.in_age.text().strip() and not ok_number(self.in_age.text().strip()):
+            QMessageBox.warning(self, "Validação", "Idade mínima inválida. Informe um número de dias.")
+            return False
+        if self.chk_regex.isChecked() and self.in_regex.text().strip():
+            try:
+                re.compile(self.in_regex.text().strip())
+            except re.error as e:
+                QMessageBox.warning(self, "Validação", f"Expressão regular de nome inválida:\n{e}")
+                return False
+
         # 6) se Excel, cheque arquivo
         if cfg["use_conditions"] and cfg["condition_mode"] == "excel":
             path = cfg["excel"].strip()
@@ -984,6 +1250,34 @@ class MainWindow(QMainWindow):
         bg = QButtonGroup(); bg.addButton(self.rb_move); bg.addButton(self.rb_copy); bg.addButton(self.rb_delete)
         h_act.addWidget(self.rb_move); h_act.addWidget(self.rb_copy); h_act.addWidget(self.rb_delete); h_act.addStretch()
         lo.addLayout(h_act)
+        h_copy = QHBoxLayout(); h_copy.setSpacing(8)
+        h_copy.addWidget(QLabel("Cópia:"))
+        self.combo_copy_backend = QComboBox()
+        self.combo_copy_backend.addItem("Automática", "auto")
+        self.combo_copy_backend.addItem("Reflink (CoW)", "reflink")
+        self.combo_copy_backend.addItem("copy_file_range", "copy_file_range")
+        self.combo_copy_backend.addItem("sendfile", "sendfile")
+        self.combo_copy_backend.addItem("Buffer (readinto)", "readinto")
+        self.combo_copy_backend.setToolTip(
+            "Automática tenta reflink, copy_file_range, sendfile e por fim cópia com buffer; "
+            "o método usado em cada arquivo aparece no relatório."
+        )
+        h_copy.addWidget(self.combo_copy_backend); h_copy.addStretch()
+        lo.addLayout(h_copy)
+        h_policy = QHBoxLayout(); h_policy.setSpacing(8)
+        h_policy.addWidget(QLabel("Arquivos existentes:"))
+        self.combo_policy = QComboBox()
+        self.combo_policy.addItem("Sobrescrever", "overwrite")
+        self.combo_policy.addItem("Pular inalterados", "skip_unchanged")
+        self.combo_policy.addItem("Mais novo vence", "newer")
+        self.combo_policy.setToolTip(
+            "Pular inalterados: usa o manifesto da última execução e não copia de novo o que "
+            "não mudou na origem nem no destino. Mais novo vence: só grava se a origem for mais recente."
+        )
+        h_policy.addWidget(self.combo_policy); h_policy.addStretch()
+        lo.addLayout(h_policy)
+        self.chk_metadata = QCheckBox("Preservar metadados"); self.chk_metadata.setChecked(True)
+        add_flag_with_info(lo, self.chk_metadata, FLAG_INFOS["chk_metadata"])
         self.layout.addWidget(grp)
 
     # ─── Threads ──────────────────────────────────────────────────────────
@@ -1005,6 +1299,15 @@ class MainWindow(QMainWindow):
         self.slider_threads.valueChanged.connect(lambda v: self.label_threads.setText(f"{v} / {self.max_workers}"))
         lo.addWidget(self.slider_threads)
         lo.addWidget(self.label_threads)
+        lo.addWidget(QLabel("Casamento:"))
+        self.combo_exec_mode = QComboBox()
+        self.combo_exec_mode.addItem("Threads", "threads")
+        self.combo_exec_mode.addItem("Processos", "processes")
+        self.combo_exec_mode.setToolTip(
+            "Processos: o casamento das condições roda em processos separados (usa vários núcleos "
+            "em planilhas grandes); a cópia/movimentação continua nas threads."
+        )
+        lo.addWidget(self.combo_exec_mode)
         lo.addStretch()
         self.layout.addWidget(grp)
     
@@ -1034,7 +1337,8 @@ class MainWindow(QMainWindow):
         self.le_excel = DropLineEdit()
         self.le_excel.textChanged.connect(self.load_conditions_from_excel)
         def on_excel_browse():
-            self._select_file(self.le_excel, "Excel (*.xlsx *.xls)")
+            from executor import CONDITION_SOURCE_FILTER
+            self._select_file(self.le_excel, CONDITION_SOURCE_FILTER)
             self.load_conditions_from_excel()
         btn_exc = QPushButton("🔍")
         btn_exc.setFixedHeight(18)
@@ -1114,6 +1418,16 @@ class MainWindow(QMainWindow):
         self.le_expr = QLineEdit(); self.le_expr.setToolTip("Use & para E, | para OU, () para agrupar")
         form.addRow("Expressão:", self.le_expr)
 
+        self.combo_engine = QComboBox()
+        self.combo_engine.addItem("Automático", "auto")
+        self.combo_engine.addItem("Índice de tokens", "index")
+        self.combo_engine.addItem("Vetorizado (NumPy)", "vector")
+        self.combo_engine.setToolTip(
+            "Como as linhas do Excel são casadas com os arquivos. O índice é o mais rápido; "
+            "o vetorizado é indicado para expressões com muitas negações ({Cond})."
+        )
+        form.addRow("Motor de Condições:", self.combo_engine)
+
         # Atalhos - atualização em tempo real (edição de célula também)
         self.shortcuts = QHBoxLayout()
         sw = QWidget(); sw.setLayout(self.shortcuts)
@@ -1198,6 +1512,59 @@ class MainWindow(QMainWindow):
         dt2_layout.addStretch()
         adv_lo.addLayout(dt2_layout)
 
+        # Linha 4: Filtro de tamanho (KB)
+        size_layout = QHBoxLayout()
+        self.chk_size = QCheckBox("Tamanho (KB)")
+        self.in_size_min = QLineEdit()
+        self.in_size_min.setPlaceholderText("mín")
+        self.in_size_min.setMaximumWidth(90)
+        self.in_size_max = QLineEdit()
+        self.in_size_max.setPlaceholderText("máx")
+        self.in_size_max.setMaximumWidth(90)
+        self.in_size_min.setToolTip("Tamanho mínimo em KB (vazio = sem limite)")
+        self.in_size_max.setToolTip("Tamanho máximo em KB (vazio = sem limite)")
+        size_layout.addWidget(self.chk_size)
+        size_layout.addWidget(self.in_size_min)
+        size_layout.addWidget(self.in_size_max)
+        size_layout.addStretch()
+        adv_lo.addLayout(size_layout)
+
+        # Linha 5: Filtro de nome por curinga
+        glob_layout = QHBoxLayout()
+        self.chk_glob = QCheckBox("Nome (curinga)")
+        self.in_glob = QLineEdit()
+        self.in_glob.setPlaceholderText("ex: *contrato*.pdf")
+        self.in_glob.setMinimumWidth(150)
+        self.in_glob.setToolTip("Padrão com * e ? aplicado ao nome do arquivo (sem diferenciar maiúsculas)")
+        glob_layout.addWidget(self.chk_glob)
+        glob_layout.addWidget(self.in_glob)
+        glob_layout.addStretch()
+        adv_lo.addLayout(glob_layout)
+
+        # Linha 6: Filtro de nome por expressão regular
+        regex_layout = QHBoxLayout()
+        self.chk_regex = QCheckBox("Nome (regex)")
+        self.in_regex = QLineEdit()
+        self.in_regex.setPlaceholderText(r"ex: ^\d{11}_")
+        self.in_regex.setMinimumWidth(150)
+        self.in_regex.setToolTip("Expressão regular procurada no nome do arquivo (sem diferenciar maiúsculas)")
+        regex_layout.addWidget(self.chk_regex)
+        regex_layout.addWidget(self.in_regex)
+        regex_layout.addStretch()
+        adv_lo.addLayout(regex_layout)
+
+        # Linha 7: Idade mínima
+        age_layout = QHBoxLayout()
+        self.chk_age = QCheckBox("Idade mínima (dias)")
+        self.in_age = QLineEdit()
+        self.in_age.setPlaceholderText("ex: 7")
+        self.in_age.setMaximumWidth(90)
+        self.in_age.setToolTip("Só processa arquivos sem modificação há pelo menos esse número de dias")
+        age_layout.addWidget(self.chk_age)
+        age_layout.addWidget(self.in_age)
+        age_layout.addStretch()
+        adv_lo.addLayout(age_layout)
+
         # ---- UX MELHORIA: Campos só editáveis quando o checkbox correspondente estiver marcado ----
         self.in_ext.setEnabled(False)
         self.in_dt1.setEnabled(False)
@@ -1205,6 +1572,13 @@ class MainWindow(QMainWindow):
         self.chk_ext.toggled.connect(self.in_ext.setEnabled)
         self.chk_dt1.toggled.connect(self.in_dt1.setEnabled)
         self.chk_dt2.toggled.connect(self.in_dt2.setEnabled)
+        for chk, fields in ((self.chk_size, (self.in_size_min, self.in_size_max)),
+                            (self.chk_glob, (self.in_glob,)),
+                            (self.chk_regex, (self.in_regex,)),
+                            (self.chk_age, (self.in_age,))):
+            for field in fields:
+                field.setEnabled(False)
+                chk.toggled.connect(field.setEnabled)
 
         # ---- UX MELHORIA: Limpa o campo ao desmarcar ----
         def clear_if_unchecked(chk, field):
@@ -1214,6 +1588,11 @@ class MainWindow(QMainWindow):
         self.chk_ext.toggled.connect(lambda: clear_if_unchecked(self.chk_ext, self.in_ext))
         self.chk_dt1.toggled.connect(lambda: clear_if_unchecked(self.chk_dt1, self.in_dt1))
         self.chk_dt2.toggled.connect(lambda: clear_if_unchecked(self.chk_dt2, self.in_dt2))
+        self.chk_size.toggled.connect(lambda: (clear_if_unchecked(self.chk_size, self.in_size_min),
+                                               clear_if_unchecked(self.chk_size, self.in_size_max)))
+        self.chk_glob.toggled.connect(lambda: clear_if_unchecked(self.chk_glob, self.in_glob))
+        self.chk_regex.toggled.connect(lambda: clear_if_unchecked(self.chk_regex, self.in_regex))
+        self.chk_age.toggled.connect(lambda: clear_if_unchecked(self.chk_age, self.in_age))
 
         # ---- MELHORIA: Validação visual de datas ----
         def validate_date(lineedit):
@@ -1260,7 +1639,7 @@ class MainWindow(QMainWindow):
         for w in (
             self.rb_excel, self.rb_folders,
             self.stacked_input, self.le_sep,
-            self.le_expr, self.table
+            self.le_expr, self.table, self.combo_engine
         ):
             w.setEnabled(not no_cond)
 
@@ -1309,9 +1688,8 @@ class MainWindow(QMainWindow):
         if not path or not os.path.isfile(path):
             return
         try:
-            import pandas as pd
-            df = pd.read_excel(path, nrows=1)
-            headers = list(df.columns)
+            from executor import condition_headers  # cabeçalho lido uma vez por versão do arquivo
+            headers = condition_headers(path)
             self.table.setRowCount(0)
             for i, col in enumerate(headers):
                 self.table.insertRow(i)
@@ -1326,7 +1704,7 @@ class MainWindow(QMainWindow):
                 self.table.setItem(i, 3, chk)
             self.update_shortcuts()
         except Exception as e:
-            QMessageBox.warning(self, "Erro", f"Falha ao ler cabeçalhos do Excel: {e}")
+            QMessageBox.warning(self, "Erro", f"Falha ao ler cabeçalhos da planilha: {e}")
     
     # ─── Execução ──────────────────────────────────────────────────────────
     
@@ -1351,15 +1729,48 @@ class MainWindow(QMainWindow):
         h.addWidget(self.btn_execute)
         h.addWidget(self.btn_cancel)
         h.addWidget(self.btn_report)
+        self.btn_resume = QPushButton("⟳ Retomar última")
+        self.btn_resume.setMinimumHeight(24)
+        self.btn_resume.setEnabled(False)
+        self.btn_resume.setToolTip("Continua a última execução cancelada ou interrompida, só com o que faltou.")
+        self.btn_resume.clicked.connect(self.resume_execution)
+        self.btn_resume.adjustSize()
+        h.addWidget(self.btn_resume)
+        self.btn_save_cfg = QPushButton("💾 Salvar config")
+        self.btn_save_cfg.setMinimumHeight(24)
+        self.btn_save_cfg.setToolTip("Grava a configuração atual em JSON para rodar sem interface:\npython cli.py config.json")
+        self.btn_save_cfg.clicked.connect(self.save_config)
+        self.btn_save_cfg.adjustSize()
+        h.addWidget(self.btn_save_cfg)
         h.addStretch()
         v.addLayout(h)
         self.chk_zip   = QCheckBox("Compactar destino ao concluir")
         add_flag_with_info(v, self.chk_zip, FLAG_INFOS["chk_zip"])
+        h_zip = QHBoxLayout(); h_zip.setSpacing(8)
+        h_zip.addWidget(QLabel("Nível:"))
+        self.spin_zip_level = QSpinBox(); self.spin_zip_level.setRange(0, 9); self.spin_zip_level.setValue(6)
+        self.spin_zip_level.setToolTip("0 = sem compressão, 9 = máxima. PDF, JPG, ZIP etc. são sempre guardados sem recomprimir.")
+        h_zip.addWidget(self.spin_zip_level)
+        h_zip.addWidget(QLabel("Dividir a cada (MB, 0 = não):"))
+        self.spin_zip_split = QSpinBox(); self.spin_zip_split.setRange(0, 1024 * 1024); self.spin_zip_split.setValue(0)
+        h_zip.addWidget(self.spin_zip_split); h_zip.addStretch()
+        v.addLayout(h_zip)
+        for w in (self.spin_zip_level, self.spin_zip_split):
+            w.setEnabled(False)
+            self.chk_zip.toggled.connect(w.setEnabled)
         self.progress  = QProgressBar()
         self.progress.setVisible(False)
         v.addWidget(self.progress)
+        self.lbl_metrics = QLabel("")
+        self.lbl_metrics.setVisible(False)
+        v.addWidget(self.lbl_metrics)
         self.layout.addWidget(grp)
-        self._last_report = []
+        self._last_report = ReportStore()
+        self._report_dlg = None
+        # executor/pandas carregam em segundo plano; o botão "Retomar" depende do executor
+        self._preloader = ModulePreloader(self)
+        self._preloader.finished.connect(self._refresh_resume)
+        QTimer.singleShot(0, self._preloader.start)
 
     def _insert_text(self, txt):
         w = self._last_edit if self._last_edit in (self.le_expr, self.le_rename) else self.le_expr
@@ -1390,9 +1801,8 @@ class MainWindow(QMainWindow):
         # Se modo Excel: lê o cabeçalho real da planilha e faz o mapeamento nome → nome
         if self.rb_excel.isChecked() and self.le_excel.text():
             try:
-                import pandas as pd
-                df = pd.read_excel(self.le_excel.text(), dtype=str, nrows=1)
-                headers = list(df.columns)
+                from executor import condition_headers
+                headers = condition_headers(self.le_excel.text())
                 for r in range(self.table.rowCount()):
                     it_n = self.table.item(r, 1)
                     it_p = self.table.item(r, 3)
@@ -1403,7 +1813,7 @@ class MainWindow(QMainWindow):
                             if it_p and it_p.checkState() == Qt.Checked:
                                 princ.append(nm)
             except Exception as e:
-                print(f"[collect_config] Erro ao ler cabeçalho Excel: {e}")
+                print(f"[collect_config] Erro ao ler cabeçalho da planilha: {e}")
         else:
             # Modo subpasta (índice)
             for r in range(self.table.rowCount()):
@@ -1426,6 +1836,23 @@ class MainWindow(QMainWindow):
             file_filters["date_start"] = self.in_dt1.text().strip()
         if self.chk_dt2.isChecked() and self.in_dt2.text().strip():
             file_filters["date_end"] = self.in_dt2.text().strip()
+        if self.chk_size.isChecked():
+            for key, field in (("size_min", self.in_size_min), ("size_max", self.in_size_max)):
+                txt = field.text().strip().replace(",", ".")
+                try:
+                    file_filters[key] = int(float(txt) * 1024) if txt else None
+                except ValueError:
+                    pass
+            file_filters = {k: v for k, v in file_filters.items() if v is not None}
+        if self.chk_glob.isChecked() and self.in_glob.text().strip():
+            file_filters["name_glob"] = self.in_glob.text().strip()
+        if self.chk_regex.isChecked() and self.in_regex.text().strip():
+            file_filters["name_regex"] = self.in_regex.text().strip()
+        if self.chk_age.isChecked() and self.in_age.text().strip():
+            try:
+                file_filters["min_age_days"] = float(self.in_age.text().strip().replace(",", "."))
+            except ValueError:
+                pass
 
         return {
             "origens":            [le.text() for _, le in self.origin_rows if le.text()],
@@ -1440,7 +1867,13 @@ class MainWindow(QMainWindow):
             "sobra_enabled":      self.chk_sobra.isChecked(),
             "sobra":              self.le_sobra.text() if self.chk_sobra.isChecked() else None,
             "zip_dest":           self.chk_zip.isChecked(),
+            "zip_level":          self.spin_zip_level.value(),
+            "zip_split_mb":       self.spin_zip_split.value(),
+            "copy_backend":       self.combo_copy_backend.currentData(),
+            "preserve_metadata":  self.chk_metadata.isChecked(),
+            "existing_policy":    self.combo_policy.currentData(),
             "max_workers":        self.slider_threads.value(),
+            "exec_mode":          self.combo_exec_mode.currentData(),
             "use_conditions":     not self.chk_none.isChecked(),
             "condition_mode":     "folders" if self.rb_folders.isChecked() else "excel",
             "excel":              self.le_excel.text(),
@@ -1449,6 +1882,7 @@ class MainWindow(QMainWindow):
             "colunas":            col_map,
             "principais":         princ,
             "condition_expression": self.le_expr.text(),
+            "match_engine":       self.combo_engine.currentData(),
             "copy_dirs":          self.chk_copydirs.isChecked(),
             "file_filters":       file_filters,
             # ==== RENOMEAÇÃO ====
@@ -1462,25 +1896,94 @@ class MainWindow(QMainWindow):
         cfg = self.collect_config()
         if not self.validate_config(cfg):
             return
+        self._start_thread(cfg)
+
+    def save_config(self):
+        cfg = self.collect_config()
+        if not self.validate_config(cfg):
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Salvar configuração como", "config.json", "JSON (*.json)")
+        if not path:
+            return
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(cfg, f, indent=2, ensure_ascii=False)
+        except OSError as e:
+            QMessageBox.warning(self, "Erro", f"Falha ao salvar configuração: {e}")
+
+    def resume_execution(self):
+        from executor import RunJournal
+        last = RunJournal.load_last()
+        if last is None:
+            self._refresh_resume()
+            return
+        cfg, done = last
+        resp = QMessageBox.question(
+            self, "Retomar execução",
+            f"Retomar a última execução ({', '.join(cfg.get('origens', []))} → {cfg.get('destino', '')})?\n"
+            f"{len(done)} itens já foram concluídos e serão pulados."
+        )
+        if resp != QMessageBox.Yes:
+            return
+        self._start_thread(cfg, resume=True)
+
+    def _start_thread(self, cfg, resume=False):
         self.btn_execute.setEnabled(False)
         self.btn_cancel.setEnabled(True)
-        self.btn_report.setEnabled(False)
+        self.btn_report.setEnabled(True)  # relatório ao vivo durante a execução
         self.progress.setValue(0)
         self.progress.setVisible(True)
         self.progress.setFormat("%v de %m arquivos processados")
+        self.lbl_metrics.setVisible(False)
+        self._last_metrics = None
         self._set_all_enabled(False)
-        self.thread = ExecutorThread(cfg)
+        self.btn_resume.setEnabled(False)
+        self.thread = ExecutorThread(cfg, resume=resume)
+        self._last_report = self.thread.report
+        if self._report_dlg is not None:
+            self._report_dlg.close()
+            self._report_dlg = None
         self.thread.progress.connect(self._on_progress)
+        self.thread.metrics.connect(self._on_metrics)
         self.thread.error.connect(lambda msg: QMessageBox.warning(self, "Erro", msg))
         self.thread.finished.connect(self.execution_finished)
         self.thread.canceled.connect(self.execution_canceled)
+        self.thread.failed.connect(self.execution_failed)
         self.thread.start()
     
-    def _on_progress(self, value, total):
-        self.progress.setMaximum(total)
-        self.progress.setValue(value)
-        self.progress.setFormat(f"{value} de {total} arquivos processados")
-    
+    def _on_metrics(self, m):
+        """Tempo por fase, fila e ocupação das threads (na dica da linha de vazão)."""
+        self._last_metrics = m
+        self.lbl_metrics.setToolTip("\n".join(f"{fase}: {seg:.2f} s" for fase, seg in m["phases_s"].items())
+                                    + f"\nfila: {m['queue_depth']}  ocupação: {m['utilization'] * 100:.0f}%")
+
+    def _on_progress(self, value, total, scanning=False, info=None):
+        # já chega agregado (no máximo ~15 por segundo); só mexe no que mudou
+        if self.progress.maximum() != total:
+            self.progress.setMaximum(total)
+        if self.progress.value() != value:
+            self.progress.setValue(value)
+        fmt = f"{value} de {total}+ arquivos processados (varrendo origens...)" if scanning \
+            else f"{value} de {total} arquivos processados"
+        if self.progress.format() != fmt:
+            self.progress.setFormat(fmt)
+        if not info:
+            return
+        eta = info.get("eta_s")
+        if eta is None:
+            eta_txt = "calculando..."
+        else:
+            eta_txt = ("≥ " if scanning else "") + time.strftime("%H:%M:%S", time.gmtime(eta))
+        txt = f"{info['files_s']:.1f} arquivos/s · {info['mb_s']:.1f} MB/s · ETA {eta_txt}"
+        m = getattr(self, "_last_metrics", None)
+        if m:
+            txt += f" · threads ocupadas {m['workers_busy']}/{m['workers']}"
+        current = info.get("current")
+        if current:
+            txt += f"\n{current if len(current) <= 80 else '…' + current[-79:]}"
+        self.lbl_metrics.setText(txt)
+        self.lbl_metrics.setVisible(True)
+
     def cancel_execution(self):
         if self.thread:
             self.thread.cancel()
@@ -1492,38 +1995,87 @@ class MainWindow(QMainWindow):
         self.btn_report.setEnabled(True)
         self.progress.setVisible(False)
         self._set_all_enabled(True)
+        self._refresh_resume()
         self._last_report = report
-        QMessageBox.information(self, "Concluído", "Execução finalizada.")
+        msg = "Execução finalizada."
+        stats = self.thread.stats if self.thread else {}
+        if stats.get("skipped"):
+            msg += f"\nTransferidos: {stats['transferred']}, pulados (inalterados): {stats['skipped']}."
+        zst = stats.get("zip")
+        if zst:
+            msg += (f"\nZIP: {zst['files']} arquivos, {zst['bytes_out'] / 1048576:.1f} de "
+                    f"{zst['bytes_in'] / 1048576:.1f} MB em {len(zst['archives'])} volume(s), {zst['seconds']:.1f} s.")
+        match = stats.get("match")
+        if match and match.get("parallelism"):
+            msg += (f"\nCasamento em {match['processes']} processos: {match['files']} arquivos, "
+                    f"paralelismo efetivo {match['parallelism']:.1f}x.")
+        QMessageBox.information(self, "Concluído", msg)
         self.show_report()
     
-    def execution_canceled(self):
+    def execution_canceled(self, latency=0.0):
         self.btn_execute.setEnabled(True)
         self.btn_cancel.setEnabled(False)
         self.btn_report.setEnabled(bool(self._last_report))
         self.progress.setVisible(False)
         self._set_all_enabled(True)
-        QMessageBox.information(self, "Cancelado", "Execução foi cancelada pelo usuário.")
+        self._refresh_resume()
+        QMessageBox.information(self, "Cancelado", f"Execução foi cancelada pelo usuário (parou em {latency:.1f} s).")
+
+    def execution_failed(self, msg):
+        self.btn_execute.setEnabled(True)
+        self.btn_cancel.setEnabled(False)
+        self.btn_report.setEnabled(bool(self._last_report))
+        self.progress.setVisible(False)
+        self._set_all_enabled(True)
+        self._refresh_resume()
+        QMessageBox.warning(self, "Erro", msg)
+
+    def _refresh_resume(self):
+        """Habilita "Retomar" quando a última execução ficou pela metade."""
+        try:
+            from executor import RunJournal
+            self.btn_resume.setEnabled(RunJournal.load_last() is not None)
+        except Exception:
+            self.btn_resume.setEnabled(False)
 
     def _set_all_enabled(self, enabled):
         widgets = [
             self.combo_theme, self.add_origin_btn, self.input_dest, self.chk_extract,
             self.chk_sub, self.chk_hierarchy, self.chk_multiply, self.chk_sobra,
             self.le_sobra, self.chk_recursive, self.rb_move, self.rb_copy, self.rb_delete,
-            self.slider_threads, self.chk_none, self.rb_excel, self.rb_folders,
+            self.combo_copy_backend, self.chk_metadata, self.combo_policy,
+            self.slider_threads, self.combo_exec_mode, self.chk_none, self.rb_excel, self.rb_folders,
             self.le_excel, self.le_folder, self.le_sep,
-            self.table, self.le_expr, self.chk_zip
+            self.table, self.le_expr, self.combo_engine, self.chk_zip
         ]
         for w in widgets:
             try: w.setEnabled(enabled)
             except: pass
+        for w in (self.spin_zip_level, self.spin_zip_split):
+            w.setEnabled(enabled and self.chk_zip.isChecked())
         self.btn_cancel.setEnabled(not enabled and self.thread is not None)
     
     def show_report(self):
-        if self._last_report:
-            dlg = ReportDialog(self._last_report, self)
-            dlg.exec()
-        else:
+        running = self.thread is not None and self.thread.isRunning()
+        if not self._last_report and not running:
             QMessageBox.information(self, "Relatório", "Nenhum relatório disponível.")
+            return
+        if self._report_dlg is None:
+            # não modal: durante a execução as linhas chegam em lotes pelo sinal rows_added
+            self._report_dlg = ReportDialog(self._last_report, self)
+            self._report_dlg.setAttribute(Qt.WA_DeleteOnClose)
+            self._report_dlg.finished.connect(self._report_closed)
+            if running:
+                self.thread.rows_added.connect(self._report_dlg.sync)
+        self._report_dlg.sync()
+        self._report_dlg.show()
+        self._report_dlg.raise_()
+        self._report_dlg.activateWindow()
+
+    def _report_closed(self, _=None):
+        self._report_dlg = None
 
 if __name__ == "__main__":
+    import multiprocessing
+    multiprocessing.freeze_support()  # processos de casamento no executável empacotado
     show_splash_and_run(MainWindow)
@@ -0,0 +1,493 @@
+#report.py
+"""Relatório de execução em colunas (sem Qt).
+
+O Executor entrega um dicionário por arquivo processado; guardar centenas de
+milhares desses dicionários (e, pior, um widget por célula) custa gigabytes.
+``ReportStore`` guarda cada campo numa coluna compacta — caminhos divididos em
+pasta (internada, um índice por linha) + nome, ação e método como códigos de
+um byte, tempo num ``array('d')`` — e, passado um limite de linhas, despeja o
+que já tem num SQLite temporário. É lido por índice pelo modelo da tabela
+(``main.ReportModel``), exportado em fluxo, linha a linha (xlsx, CSV, JSON
+Lines, Parquet), e reimportado em blocos.
+"""
+import os, csv, json, math, sqlite3, tempfile, threading
+from array import array
+from enum import IntEnum
+
+# Colunas do relatório: (chave no dicionário do Executor, título)
+REPORT_COLUMNS = [
+    ("arquivo", "Arquivo"), ("origem", "Origem"), ("destino", "Destino"),
+    ("acao", "Ação"), ("linhas", "Linhas Excel"), ("metodo", "Método"), ("tempo_ms", "Tempo (ms)"),
+]
+
+class Acao(IntEnum):
+    """Ações do Executor; o código é o que fica guardado na coluna ``acao``."""
+    COPY = 0
+    MOVE = 1
+    DELETE = 2
+
+def _split_path(text):
+    """``"/a/b/c.pdf"`` → ``("/a/b/", "c.pdf")``; a junção devolve exatamente o texto original."""
+    cut = max(text.rfind("/"), text.rfind("\\")) + 1
+    return text[:cut], text[cut:]
+
+class _CodeColumn:
+    """Valores repetidos (ação, método): um byte por linha + tabela de valores."""
+    __slots__ = ("values", "index", "codes")
+
+    def __init__(self, seed=()):
+        self.values = list(seed)
+        self.index = {v: i for i, v in enumerate(self.values)}
+        self.codes = array("B")
+
+    def _code(self, value):
+        code = self.index.get(value)
+        if code is None:
+            if len(self.values) >= 255:
+                raise OverflowError("valores distintos demais para uma coluna de códigos")
+            code = self.index[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def append(self, value):
+        self.codes.append(self._code(value))
+
+    def get(self, i):
+        return self.values[self.codes[i]]
+
+    def clear(self):
+        self.codes = array("B")
+
+class _PathColumn:
+    """Caminhos: pasta internada (índice em ``array('I')``) + nome do arquivo."""
+    __slots__ = ("dirs", "dir_index", "dir_ids", "names")
+
+    def __init__(self, dirs, dir_index):
+        self.dirs, self.dir_index = dirs, dir_index  # tabela de pastas compartilhada entre colunas
+        self.dir_ids = array("I")
+        self.names = []
+
+    def append(self, value, name_hint=None):
+        folder, name = _split_path(value)
+        dir_id = self.dir_index.get(folder)
+        if dir_id is None:
+            dir_id = self.dir_index[folder] = len(self.dirs)
+            self.dirs.append(folder)
+        self.dir_ids.append(dir_id)
+        # o nome quase sempre é o próprio "arquivo": reaproveita o mesmo objeto str
+        self.names.append(name_hint if name == name_hint else name)
+
+    def get(self, i):
+        return self.dirs[self.dir_ids[i]] + self.names[i]
+
+    def clear(self):
+        self.dir_ids = array("I")
+        self.names = []
+
+class _FloatColumn:
+    """Números em ``array('d')`` (ausente = NaN); vira lista comum se aparecer texto."""
+    __slots__ = ("data", "numeric")
+
+    def __init__(self):
+        self.data = array("d")
+        self.numeric = True
+
+    def append(self, value):
+        if self.numeric:
+            if value is None or value == "":
+                self.data.append(math.nan)
+                return
+            if isinstance(value, (int, float)):
+                self.data.append(value)
+                return
+            self.data = [None if math.isnan(v) else v for v in self.data]
+            self.numeric = False
+        self.data.append(value)
+
+    def get(self, i):
+        value = self.data[i]
+        if self.numeric and math.isnan(value):
+            return None
+        return value
+
+    def clear(self):
+        self.data = array("d") if self.numeric else []
+
+class _ListColumn:
+    __slots__ = ("data",)
+
+    def __init__(self):
+        self.data = []
+
+    def append(self, value):
+        self.data.append(value)
+
+    def get(self, i):
+        return self.data[i]
+
+    def clear(self):
+        self.data = []
+
+class ReportStore:
+    """Relatório em colunas compactas, com transbordo para SQLite.
+
+    Um único produtor (a thread da execução) acrescenta linhas enquanto a
+    interface lê; leituras e escritas passam pela mesma trava. Quando há
+    ``spill_rows`` linhas em memória elas vão para um SQLite temporário e a
+    memória é liberada (``spill_rows=None`` desliga o transbordo).
+    """
+    SPILL_ROWS = 250_000
+    PAGE = 2048  # linhas lidas do SQLite por vez
+
+    def __init__(self, columns=REPORT_COLUMNS, spill_rows=SPILL_ROWS):
+        self.keys = [key for key, _ in columns]
+        self.titles = [title for _, title in columns]
+        self._pos = {key: i for i, key in enumerate(self.keys)}
+        self.spill_rows = spill_rows
+        self._lock = threading.RLock()
+        self._n = 0
+        self._spilled = 0  # linhas [0, _spilled) estão no SQLite
+        self._db = None
+        self._db_path = None
+        self._pages = {}
+        dirs, dir_index = [], {}
+        self._cols = {}
+        for key in self.keys:
+            if key in ("origem", "destino"):
+                self._cols[key] = _PathColumn(dirs, dir_index)
+            elif key == "acao":
+                self._cols[key] = _CodeColumn(a.name.lower() for a in Acao)
+            elif key == "metodo":
+                self._cols[key] = _CodeColumn()
+            elif key == "tempo_ms":
+                self._cols[key] = _FloatColumn()
+            else:
+                self._cols[key] = _ListColumn()
+
+    @classmethod
+    def from_records(cls, records, columns=REPORT_COLUMNS, **kwargs):
+        store = cls(columns, **kwargs)
+        store.extend(records)
+        return store
+
+    def append(self, item):
+        with self._lock:
+            name = item.get("arquivo", "")
+            for key, col in self._cols.items():
+                value = item.get(key, "")
+                if isinstance(col, _PathColumn):
+                    col.append("" if value is None else str(value), name)
+                else:
+                    col.append(value)
+            self._n += 1
+            if self.spill_rows and self._n - self._spilled >= self.spill_rows:
+                self._spill()
+
+    def extend(self, items):
+        for item in items:
+            self.append(item)
+
+    def __len__(self):
+        return self._n
+
+    # ---------- transbordo ----------
+
+    def _spill(self):
+        if self._db is None:
+            fd, self._db_path = tempfile.mkstemp(prefix="gaal_relatorio_", suffix=".sqlite")
+            os.close(fd)
+            self._db = sqlite3.connect(self._db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=OFF")
+            self._db.execute("PRAGMA synchronous=OFF")
+            cols = ", ".join(f'"{k}"' for k in self.keys)
+            self._db.execute(f"CREATE TABLE rel (id INTEGER PRIMARY KEY, {cols})")
+        marks = ", ".join("?" * (len(self.keys) + 1))
+        rows = ((self._spilled + i, *(_to_sql(v) for v in self._memory_row(i)))
+                for i in range(self._n - self._spilled))
+        with self._db:
+            self._db.executemany(f"INSERT INTO rel VALUES ({marks})", rows)
+        for col in self._cols.values():
+            col.clear()
+        self._spilled = self._n
+
+    def _memory_row(self, i):
+        return tuple(self._cols[key].get(i) for key in self.keys)
+
+    def _page(self, page):
+        rows = self._pages.get(page)
+        if rows is None:
+            start = page * self.PAGE
+            cur = self._db.execute("SELECT * FROM rel WHERE id >= ? AND id < ? ORDER BY id",
+                                   (start, start + self.PAGE))
+            rows = [tuple(_from_sql(v) for v in r[1:]) for r in cur]
+            if len(self._pages) >= 16:
+                self._pages.pop(next(iter(self._pages)))
+            self._pages[page] = rows
+        return rows
+
+    def close(self):
+        """Apaga o SQLite temporário (se houve transbordo)."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+                try:
+                    os.remove(self._db_path)
+                except OSError:
+                    pass
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    # ---------- leitura ----------
+
+    def row_tuple(self, i):
+        with self._lock:
+            if i < self._spilled:
+                return self._page(i // self.PAGE)[i % self.PAGE]
+            return self._memory_row(i - self._spilled)
+
+    def value(self, row, key):
+        with self._lock:
+            if row < self._spilled:
+                return self._page(row // self.PAGE)[row % self.PAGE][self._pos[key]]
+            return self._cols[key].get(row - self._spilled)
+
+    def row(self, i):
+        return dict(zip(self.keys, self.row_tuple(i)))
+
+    def iter_rows(self, chunk=PAGE):
+        """Linhas como tuplas, na ordem de ``keys``, sem montar tudo em memória."""
+        i = 0
+        while i < self._n:
+            with self._lock:
+                stop = min(self._n, i + chunk)
+                if i < self._spilled:
+                    stop = min(stop, self._spilled)
+                    cur = self._db.execute("SELECT * FROM rel WHERE id >= ? AND id < ? ORDER BY id", (i, stop))
+                    rows = [tuple(_from_sql(v) for v in r[1:]) for r in cur]
+                else:
+                    base = self._spilled
+                    cols = [[self._cols[key].get(j - base) for j in range(i, stop)] for key in self.keys]
+                    rows = list(zip(*cols))
+            yield from rows
+            i = stop
+
+    def __iter__(self):
+        for values in self.iter_rows():
+            yield dict(zip(self.keys, values))
+
+    def column(self, key, start=0, stop=None):
+        """Valores de uma coluna nas linhas [start, stop) (lista nova; padrão: todas)."""
+        with self._lock:
+            stop = self._n if stop is None else min(stop, self._n)
+            out = []
+            if start < self._spilled:
+                cur = self._db.execute(f'SELECT "{key}" FROM rel WHERE id >= ? AND id < ? ORDER BY id',
+                                       (start, min(stop, self._spilled)))
+                out.extend(_from_sql(v[0]) for v in cur)
+            col = self._cols[key]
+            base = self._spilled
+            out.extend(col.get(i - base) for i in range(max(start, base), stop))
+        return out
+
+    def count(self, key, value):
+        with self._lock:
+            total = 0
+            if self._spilled:
+                total = self._db.execute(f'SELECT COUNT(*) FROM rel WHERE "{key}" = ?', (_to_sql(value),)).fetchone()[0]
+            col = self._cols[key]
+            if isinstance(col, _CodeColumn):
+                code = col.index.get(value)
+                return total + (col.codes.count(code) if code is not None else 0)
+            return total + sum(1 for i in range(self._n - self._spilled) if col.get(i) == value)
+
+def _to_sql(value):
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    return "\0json" + json.dumps(value, ensure_ascii=False, default=str)
+
+def _from_sql(value):
+    if isinstance(value, str) and value.startswith("\0json"):
+        return json.loads(value[5:])
+    return value
+
+# ---------- exportação em fluxo ----------
+
+def _cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        return str(list(value))
+    return value
+
+def export_csv(store, path):
+    with open(path, "w", encoding="utf-8-sig", newline="") as fh:  # BOM: o Excel reconhece os acentos
+        writer = csv.writer(fh)
+        writer.writerow(store.keys)
+        for values in store.iter_rows():
+            writer.writerow([_cell(v) for v in values])
+
+def export_jsonl(store, path):
+    with open(path, "w", encoding="utf-8") as fh:
+        for item in store:
+            fh.write(json.dumps(item, ensure_ascii=False, default=str) + "\n")
+
+XLSX_MAX_ROWS = 1_048_576  # limite de linhas por planilha do Excel (cabeçalho incluído)
+
+def export_xlsx(store, path, max_rows=XLSX_MAX_ROWS):
+    """Planilha em modo write-only do openpyxl: as linhas vão direto para o arquivo.
+    Passado o limite do Excel, continua em novas abas ("Relatório (2)", ...)."""
+    from openpyxl import Workbook
+    wb = Workbook(write_only=True)
+    ws, sheet, used = None, 0, max_rows
+    for values in store.iter_rows():
+        if used >= max_rows:
+            sheet += 1
+            ws = wb.create_sheet("Relatório" if sheet == 1 else f"Relatório ({sheet})")
+            ws.append(store.keys)
+            used = 1
+        ws.append([_cell(v) for v in values])
+        used += 1
+    if ws is None:
+        wb.create_sheet("Relatório").append(store.keys)
+    wb.save(path)
+
+PARQUET_BATCH = 65_536
+
+def export_parquet(store, path, batch=PARQUET_BATCH):
+    """Parquet (requer pyarrow), gravado em grupos de ``batch`` linhas."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Exportar Parquet requer o pacote pyarrow (pip install pyarrow).")
+    schema = pa.schema([(k, pa.float64() if k == "tempo_ms" else pa.string()) for k in store.keys])
+
+    def text(v):
+        v = _cell(v)
+        return None if v == "" else str(v)
+
+    def number(v):
+        try:
+            return float(v) if v not in (None, "") else None
+        except (TypeError, ValueError):
+            return None
+    conv = [number if k == "tempo_ms" else text for k in store.keys]
+    with pq.ParquetWriter(str(path), schema) as writer:
+        rows = []
+        for values in store.iter_rows():
+            rows.append(values)
+            if len(rows) >= batch:
+                writer.write_batch(_arrow_batch(pa, schema, conv, rows))
+                rows = []
+        if rows or not len(store):
+            writer.write_batch(_arrow_batch(pa, schema, conv, rows))
+
+def _arrow_batch(pa, schema, conv, rows):
+    cols = list(zip(*rows)) if rows else [()] * len(conv)
+    return pa.RecordBatch.from_arrays(
+        [pa.array([f(v) for v in col], type=field.type) for f, col, field in zip(conv, cols, schema)],
+        schema=schema)
+
+EXPORTERS = {".csv": export_csv, ".jsonl": export_jsonl, ".xlsx": export_xlsx, ".parquet": export_parquet}
+
+def export_report(store, path):
+    """Exporta pelo formato da extensão (.xlsx, .csv, .jsonl ou .parquet)."""
+    ext = os.path.splitext(str(path))[1].lower()
+    if ext not in EXPORTERS:
+        raise ValueError(f"Formato de relatório não suportado: {ext or path}")
+    EXPORTERS[ext](store, path)
+
+# ---------- importação em blocos ----------
+
+IMPORT_CHUNK = 5000
+
+def _header_map(header, columns=REPORT_COLUMNS):
+    """Cabeçalho do arquivo → chaves do relatório (aceita a chave ou o título)."""
+    known = {}
+    for key, title in columns:
+        known[key.lower()] = key
+        known[title.lower()] = key
+    return [known.get(str(h).strip().lower()) if h is not None else None for h in header]
+
+def _record(keys, values):
+    item = {}
+    for key, value in zip(keys, values):
+        if key is None:
+            continue
+        if value is None:
+            value = ""
+        elif key == "tempo_ms" and isinstance(value, str) and value:
+            try:
+                value = float(value)
+            except ValueError:
+                pass
+        item[key] = value
+    return item
+
+def _chunks(records, chunk):
+    block = []
+    for rec in records:
+        block.append(rec)
+        if len(block) >= chunk:
+            yield block
+            block = []
+    if block:
+        yield block
+
+def _read_csv(path):
+    with open(path, "r", encoding="utf-8-sig", newline="") as fh:
+        reader = csv.reader(fh)
+        keys = _header_map(next(reader, []))
+        for values in reader:
+            yield _record(keys, values)
+
+def _read_jsonl(path):
+    with open(path, "r", encoding="utf-8") as fh:
+        for line in fh:
+            if line.strip():
+                rec = json.loads(line)
+                yield _record(list(rec), list(rec.values()))
+
+def _read_xlsx(path):
+    from openpyxl import load_workbook
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        for ws in wb.worksheets:  # relatórios divididos continuam nas abas seguintes
+            rows = ws.iter_rows(values_only=True)
+            keys = _header_map(next(rows, ()))
+            for values in rows:
+                if any(v is not None for v in values):
+                    yield _record(keys, values)
+    finally:
+        wb.close()
+
+def _read_parquet(path):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Importar Parquet requer o pacote pyarrow (pip install pyarrow).")
+    for batch in pq.ParquetFile(str(path)).iter_batches(batch_size=IMPORT_CHUNK):
+        for rec in batch.to_pylist():
+            yield _record(list(rec), list(rec.values()))
+
+def _read_xls(path):
+    import pandas as pd  # formato antigo: sem leitura em fluxo, vai pelo pandas (xlrd)
+    df = pd.read_excel(path, dtype=object)
+    keys = _header_map(df.columns)
+    for values in df.itertuples(index=False, name=None):
+        yield _record(keys, [None if v is None or v != v else v for v in values])
+
+READERS = {".csv": _read_csv, ".xls": _read_xls, ".jsonl": _read_jsonl, ".xlsx": _read_xlsx, ".parquet": _read_parquet}
+
+def import_report(path, chunk=IMPORT_CHUNK):
+    """Lê um relatório exportado em blocos de ``chunk`` registros (listas de dicts),
+    para preencher um ``ReportStore`` aos poucos sem carregar o arquivo inteiro."""
+    ext = os.path.splitext(str(path))[1].lower()
+    if ext not in READERS:
+        raise ValueError(f"Formato de relatório não suportado: {ext or path}")
+    return _chunks(READERS[ext](path), chunk)
@@ -0,0 +1,109 @@
+import os, sys, zlib, zipfile
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import executor
+from executor import Executor
+
+def _run(cfg):
+    errors, reports = [], []
+    ex = Executor(cfg, max_workers=cfg["max_workers"], error_callback=errors.append,
+                  report_callback=reports.append)
+    ex.run()
+    return ex, errors, reports
+
+def _excel_cfg(tmp_path, **extra):
+    sheet = tmp_path / "condicoes.xlsx"
+    pd.DataFrame({"CPF": ["111", "222"], "Nome": ["ana", "bia"]}).to_excel(sheet, index=False)
+    dst = tmp_path / "dst"
+    dst.mkdir()
+    cfg = dict(origens=[str(tmp_path / "src")], destino=str(dst), action="copy", use_conditions=True,
+               condition_mode="excel", excel=str(sheet), colunas={"CPF": "CPF", "Nome": "Nome"},
+               principais=[], condition_expression="!CPF!", max_workers=2, journal=False, cond_cache=False,
+               profile_path=str(tmp_path / "perfil.json"))
+    cfg.update(extra)
+    return cfg
+
+def test_delete_keeps_zip_members_with_multiply(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    with zipfile.ZipFile(src / "lote.zip", "w") as zf:
+        zf.writestr("doc_111.txt", "a")
+        zf.writestr("doc_111_222.txt", "b")
+    (src / "solto_222.txt").write_text("c")
+    cfg = _excel_cfg(tmp_path, action="delete", extract_zips=True, multiply=True)
+
+    ex, errors, reports = _run(cfg)
+
+    assert errors == []
+    assert None not in reports
+    # só o arquivo solto é apagado; o ZIP e seus membros ficam intactos
+    assert [r["arquivo"] for r in reports] == ["solto_222.txt"]
+    assert not (src / "solto_222.txt").exists()
+    with zipfile.ZipFile(src / "lote.zip") as zf:
+        assert sorted(zf.namelist()) == ["doc_111.txt", "doc_111_222.txt"]
+
+def _zip_with(path, date_time, content):
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr(zipfile.ZipInfo("doc_111.txt", date_time), content)
+
+def test_skip_unchanged_hashes_zip_members(tmp_path, monkeypatch):
+    monkeypatch.setattr(executor, "CACHE_DIR", tmp_path / "cache")
+    src = tmp_path / "src"
+    src.mkdir()
+    _zip_with(src / "lote.zip", (2020, 1, 1, 0, 0, 0), "igual")
+    cfg = _excel_cfg(tmp_path, extract_zips=True, existing_policy="skip_unchanged", manifest_hash=True)
+    _, errors, reports = _run(cfg)
+    assert errors == [] and [r["metodo"] for r in reports] == ["zip"]
+
+    # só a data do membro muda: o hash do conteúdo (lido de dentro do ZIP) diz que é o mesmo
+    _zip_with(src / "lote.zip", (2021, 6, 1, 0, 0, 0), "igual")
+    _, errors, reports = _run(cfg)
+    assert errors == [] and [r["metodo"] for r in reports] == ["skip"]
+
+    # conteúdo diferente com o mesmo tamanho: extrai de novo
+    _zip_with(src / "lote.zip", (2022, 6, 1, 0, 0, 0), "outro")
+    _, errors, reports = _run(cfg)
+    assert errors == [] and [r["metodo"] for r in reports] == ["zip"]
+    assert (tmp_path / "dst" / "doc_111.txt").read_text() == "outro"
+
+def _zip_source(tmp_path):
+    src = tmp_path / "dados"
+    (src / "sub").mkdir(parents=True)
+    files = {
+        "texto.txt": b"linha repetida\n" * 4000,
+        "sub/foto.jpg": bytes(range(256)) * 40,     # extensão "store"
+        "sub/aleatorio.bin": os.urandom(50_000),    # não comprime: vira stored
+        "sub/grande.txt": b"0123456789" * 30_000,   # acima de inline_max: streaming
+        "vazio.txt": b"",
+    }
+    for name, data in files.items():
+        (src / name).write_bytes(data)
+    return src, {f"dados/{k}": v for k, v in files.items()}
+
+def _read_volumes(paths):
+    members = {}
+    for path in paths:
+        with zipfile.ZipFile(path) as zf:
+            assert zf.testzip() is None
+            for info in zf.infolist():
+                data = zf.read(info)
+                assert zlib.crc32(data) == info.CRC
+                assert len(data) == info.file_size
+                members[info.filename] = data
+    return members
+
+@pytest.mark.parametrize("split_bytes", [0, 60_000])
+def test_zip_directory_round_trip(tmp_path, split_bytes):
+    src, expected = _zip_source(tmp_path)
+    stats = executor.zip_directory(src, tmp_path / "saida.zip", split_bytes=split_bytes,
+                                   workers=3, inline_max=100_000)
+    assert stats["files"] == len(expected)
+    if split_bytes:
+        assert len(stats["archives"]) > 1
+    else:
+        assert stats["archives"] == [str(tmp_path / "saida.zip")]
+    assert _read_volumes(stats["archives"]) == expected